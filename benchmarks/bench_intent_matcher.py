@@ -0,0 +1,68 @@
+"""Microbenchmark: the reference IntentMatcher vs. the per-call regex loop.
+
+Run from the repository root:
+    python benchmarks/bench_intent_matcher.py
+"""
+import re
+import timeit
+
+from common import load_backend
+from intent_matcher import IntentMatcher
+
+def legacy_extract(command):
+    """The original loop: rebuild the pattern dicts and re.search each one"""
+    command = command.lower().strip()
+    intent = "unknown"
+    entities = {}
+    intent_patterns = {
+        name: r'\b(' + '|'.join(keywords) + r')\b' for name, keywords in backend.INTENT_KEYWORDS.items()
+    }
+    for intent_name, pattern in intent_patterns.items():
+        if re.search(pattern, command):
+            intent = intent_name
+            break
+    service_patterns = {
+        name: r'\b(' + '|'.join(keywords) + r')\b' for name, keywords in backend.SERVICE_KEYWORDS.items()
+    }
+    for service, pattern in service_patterns.items():
+        if re.search(pattern, command):
+            entities["service"] = service
+            break
+    return intent, entities
+
+UTTERANCES = [
+    "hello there",
+    "tell me about your company",
+    "what services do you offer for mobile apps",
+    "how much does a website cost",
+    "what is your phone number",
+    "how many developers are on your team",
+    "how do you work with clients",
+    "what tech stack do you use for machine learning",
+    "how long will a cloud migration take",
+    "can i see some case studies of work done",
+    "open site please",
+    "thank you goodbye",
+    "i need seo and social media marketing",
+    "do you build ui and ux designs",
+    "something completely unrelated to anything",
+]
+
+def main():
+    matcher = IntentMatcher(backend.INTENT_KEYWORDS, backend.SERVICE_KEYWORDS)
+    for utterance in UTTERANCES:
+        expected = legacy_extract(utterance)
+        actual = matcher.match(utterance)
+        assert actual == expected, f"{utterance!r}: {actual} != {expected}"
+
+    number = 2000
+    legacy = timeit.timeit(lambda: [legacy_extract(u) for u in UTTERANCES], number=number)
+    compiled = timeit.timeit(lambda: [matcher.match(u) for u in UTTERANCES], number=number)
+    calls = number * len(UTTERANCES)
+    print(f"legacy loop:    {legacy / calls * 1e6:8.2f} us/call")
+    print(f"IntentMatcher:  {compiled / calls * 1e6:8.2f} us/call")
+    print(f"speedup:        {legacy / compiled:8.1f}x")
+
+if __name__ == "__main__":
+    backend = load_backend()
+    main()
@@ -0,0 +1,212 @@
+"""Benchmark the text pipeline and the chat session lifecycle.
+
+Builds the assistant headless (fake TTS engine, scripted recognizer),
+replays benchmarks/utterances.txt through extract_intent_and_entities and
+generate_contextual_response, and reports startup time, latency
+percentiles, single-core throughput and memory per session.
+
+Run from the repository root:
+    python benchmarks/bench_pipeline.py                      # print results
+    python benchmarks/bench_pipeline.py --save baseline.json # record a baseline
+    python benchmarks/bench_pipeline.py --compare baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from common import load_backend, percentile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+def latency_stats(samples_ns):
+    return {
+        "p50_us": round(percentile(samples_ns, 50) / 1000, 2),
+        "p95_us": round(percentile(samples_ns, 95) / 1000, 2),
+        "p99_us": round(percentile(samples_ns, 99) / 1000, 2),
+        "mean_us": round(sum(samples_ns) / len(samples_ns) / 1000, 2)
+    }
+
+def bench_startup(backend, import_ms):
+    """Time until each mode can serve its first request"""
+    start = time.perf_counter()
+    assistant = backend.AdvancedInonetecxAssistant(
+        engine_factory=backend.FakeTTSEngine,
+        recognizer_chain=backend.RecognizerChain([backend.ScriptedRecognizerBackend([])])
+    )
+    assistant_ms = (time.perf_counter() - start) * 1000
+    assistant.respond("hello")
+    first_response_ms = (time.perf_counter() - start) * 1000
+    assistant.speech.shutdown()
+    assistant.recognizer_chain.shutdown()
+
+    start = time.perf_counter()
+    backend.InonetecxChatSession()
+    session_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    server = backend.ChatServer(("127.0.0.1", 0), backend.SessionManager(backend.default_knowledge_base_store()))
+    server_ready_ms = (time.perf_counter() - start) * 1000
+    server.server_close()
+
+    return {
+        "import_ms": round(import_ms, 3),
+        "assistant_ms": round(assistant_ms, 3),
+        "assistant_first_response_ms": round(first_response_ms, 3),
+        "session_ms": round(session_ms, 3),
+        "server_ready_ms": round(server_ready_ms, 3),
+        # Audio stacks must stay unimported on the text path
+        "audio_modules_loaded": int(any(name in sys.modules for name in ("speech_recognition", "pyttsx3")))
+    }
+
+def bench_pipeline(backend, corpus, rounds, cold):
+    """Per-utterance latency of intent extraction + response generation"""
+    session = backend.InonetecxChatSession()
+    cache = session.response_cache
+    samples = []
+    perf_counter_ns = time.perf_counter_ns
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for utterance in corpus:
+            if cold:
+                cache.invalidate()
+            t0 = perf_counter_ns()
+            intent, entities = session.extract_intent_and_entities(utterance)
+            session.generate_contextual_response(intent, entities, utterance)
+            samples.append(perf_counter_ns() - t0)
+    elapsed = time.perf_counter() - start
+    stats = latency_stats(samples)
+    stats["throughput_per_core"] = round(len(samples) / elapsed)
+    return stats
+
+def bench_stages(backend, corpus, rounds):
+    """Latency of each pipeline stage on its own (warm response cache)"""
+    session = backend.InonetecxChatSession()
+    parsed = [(u, *session.extract_intent_and_entities(u)) for u in corpus]
+    intent_ns, response_ns = [], []
+    perf_counter_ns = time.perf_counter_ns
+    for _ in range(rounds):
+        for utterance, intent, entities in parsed:
+            t0 = perf_counter_ns()
+            session.extract_intent_and_entities(utterance)
+            t1 = perf_counter_ns()
+            session.generate_contextual_response(intent, entities, utterance)
+            response_ns.append(perf_counter_ns() - t1)
+            intent_ns.append(t1 - t0)
+    return {"intent": latency_stats(intent_ns), "response": latency_stats(response_ns)}
+
+def bench_sessions(backend, corpus, sessions, turns):
+    """Session create/respond/evict cost and memory per active session"""
+    store = backend.default_knowledge_base_store()
+    manager = backend.SessionManager(store, max_sessions=sessions)
+
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    for i in range(sessions):
+        _, session = manager.get(f"bench-{i}")
+        for turn in range(turns):
+            session.respond(corpus[(i + turn) % len(corpus)])
+    elapsed = time.perf_counter() - start
+    used = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, "filename"))
+    tracemalloc.stop()
+
+    # Creating past the cap evicts the least recently used session
+    start = time.perf_counter()
+    for i in range(sessions):
+        manager.get(f"bench-new-{i}")
+    evict_elapsed = time.perf_counter() - start
+
+    return {
+        "sessions": sessions,
+        "turns_per_session": turns,
+        "memory_per_session_kb": round(used / sessions / 1024, 2),
+        "session_turn_us": round(elapsed / (sessions * turns) * 1e6, 2),
+        "create_with_eviction_us": round(evict_elapsed / sessions * 1e6, 2)
+    }
+
+def run(args):
+    start = time.perf_counter()
+    backend = load_backend()
+    import_ms = (time.perf_counter() - start) * 1000
+    corpus = load_corpus(args.corpus)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "utterances": len(corpus),
+            "rounds": args.rounds
+        },
+        "startup": bench_startup(backend, import_ms),
+        "pipeline_warm": bench_pipeline(backend, corpus, args.rounds, cold=False),
+        "pipeline_cold": bench_pipeline(backend, corpus, max(1, args.rounds // 4), cold=True),
+        "stages": bench_stages(backend, corpus, args.rounds),
+        "sessions": bench_sessions(backend, corpus, args.sessions, args.turns)
+    }
+
+# Metrics where bigger is better; everything else numeric is a cost
+HIGHER_IS_BETTER = {"throughput_per_core"}
+IGNORED = {"meta"}
+
+def flatten(results, prefix=""):
+    for key, value in results.items():
+        if key in IGNORED:
+            continue
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from flatten(value, name + ".")
+        elif isinstance(value, (int, float)):
+            yield name, key, value
+
+def compare(results, baseline, tolerance):
+    """Print metric changes; returns the names of regressed metrics"""
+    previous = {name: value for name, _, value in flatten(baseline)}
+    regressions = []
+    for name, key, value in flatten(results):
+        if name not in previous or not previous[name]:
+            continue
+        change = (value - previous[name]) / previous[name]
+        worse = -change if key in HIGHER_IS_BETTER else change
+        flag = "REGRESSION" if worse > tolerance and key not in ("sessions", "turns_per_session") else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:45s} {previous[name]:>12} -> {value:>12} ({change:+.1%}) {flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=os.path.join(HERE, "utterances.txt"))
+    parser.add_argument("--rounds", type=int, default=200, help="passes over the corpus")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--turns", type=int, default=10, help="turns per session in the session benchmark")
+    parser.add_argument("--save", metavar="PATH", help="write results as a baseline JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown before flagging")
+    args = parser.parse_args()
+
+    results = run(args)
+    print(json.dumps(results, indent=2))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Knowledge base retrieval at scale: index build time and top-k query latency.
+
+Pads the real knowledge base passages with synthetic ones (10k+ by
+default), checks that the real questions still find their passage, and
+exits non-zero when the query p99 exceeds the retrieval latency budget.
+Both the NumPy and the pure-Python search are measured when NumPy is
+installed.
+
+Run from the repository root:
+    python benchmarks/bench_retrieval.py --passages 20000
+"""
+import argparse
+import random
+import sys
+import time
+
+from common import load_backend, percentile
+
+# Questions outside the keyword intents, with the passage title that answers them
+# (None when nothing in the knowledge base should clear the minimum score)
+QUESTIONS = [
+    ("are you aws certified", "team certifications"),
+    ("do you use flutter", "Mobile App Development technologies"),
+    ("do you know kubernetes", "Cloud Computing Solutions technologies"),
+    ("what is your mission", "Inonetecx mission"),
+    ("do you do quality assurance", "process testing"),
+    ("tensorflow or pytorch", "AI/ML Integration technologies"),
+    ("can you work in figma", "UI/UX Design technologies"),
+    ("how many clients do you have", "Inonetecx clients"),
+    ("what does a cloud setup start from", "pricing cloud solutions"),
+    ("what's the weather like", None),
+    ("what's new", None),
+    ("who won the game last night", None),
+]
+
+def synthetic_passages(count, seed):
+    """Passages drawn from a Zipf-like vocabulary, so term frequencies look like text"""
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "mi", "ru", "ten", "sa", "vo", "zen", "pri", "da", "nu", "ex", "tor", "quo"]
+    vocabulary = sorted({"".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(8000)})
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    passages = []
+    for i in range(count):
+        words = rng.choices(vocabulary, weights, k=rng.randint(6, 30))
+        passages.append((f"synthetic record {i}", " ".join(words)))
+    return passages, vocabulary
+
+def measure(backend, passages, queries, use_numpy, rounds):
+    start = time.perf_counter()
+    index = backend.PassageIndex([f"{title} {text}" for title, text in passages], use_numpy=use_numpy)
+    build_ms = (time.perf_counter() - start) * 1000
+    samples = []
+    for _ in range(rounds):
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query, k=5)
+            samples.append(time.perf_counter() - start)
+    return index, build_ms, samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--passages", type=int, default=20000, help="synthetic passages added to the knowledge base")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    backend = load_backend()
+    knowledge_base = backend.default_knowledge_base_store().current
+    synthetic, vocabulary = synthetic_passages(args.passages, args.seed)
+    passages = knowledge_base.passages + synthetic
+    rng = random.Random(args.seed)
+    queries = [question for question, _ in QUESTIONS]
+    queries += [" ".join(rng.sample(vocabulary, rng.randint(2, 8))) for _ in range(200)]
+
+    modes = [False] + ([True] if backend.optional_numpy() else [])
+    budget_ms = backend.RETRIEVAL_BUDGET * 1000
+    failed = False
+    top_results = []
+    print(f"{len(passages)} passages, {len(queries)} queries x {args.rounds} rounds, budget {budget_ms:.1f} ms")
+    for use_numpy in modes:
+        index, build_ms, samples = measure(backend, passages, queries, use_numpy, args.rounds)
+        p50, p99 = percentile(samples, 50) * 1000, percentile(samples, 99) * 1000
+        name = "numpy" if use_numpy else "pure python"
+        print(f"{name:12s} build {build_ms:8.1f} ms   query p50 {p50:.3f} ms   p99 {p99:.3f} ms")
+        failed |= p99 > budget_ms
+        top_results.append([[i for _, i in index.search(query, k=3)] for query in queries])
+
+        for question, title in QUESTIONS:
+            hits = index.search(question, k=1)
+            found = passages[hits[0][1]][0] if hits and hits[0][0] >= backend.RETRIEVAL_MIN_SCORE else None
+            if found != title:
+                print(f"  {question!r}: found {found!r}, expected {title!r}")
+                failed = True
+
+    if len(top_results) == 2 and top_results[0] != top_results[1]:
+        print("numpy and pure-python rankings differ")
+        failed = True
+    if failed:
+        print("FAILED")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
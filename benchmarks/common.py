@@ -0,0 +1,25 @@
+"""Helpers shared by the benchmark scripts"""
+import importlib.util
+import math
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def load_backend():
+    """Import 'inonetecx backend.py' (the file name is not a valid module name)"""
+    if "inonetecx_backend" in sys.modules:
+        return sys.modules["inonetecx_backend"]
+    spec = importlib.util.spec_from_file_location("inonetecx_backend", os.path.join(ROOT, "inonetecx backend.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of an unsorted list"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
@@ -0,0 +1,70 @@
+"""Check intent/service classification against a labeled utterance set.
+
+Scores the fuzzy n-gram classifier used by extract_intent_and_entities and
+the exact reference keyword matcher side by side, prints the misses and the
+classifier latency, and exits non-zero when the fuzzy classifier falls
+below the accuracy or latency budget.
+
+Run from the repository root:
+    python benchmarks/eval_intents.py
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+from common import load_backend, percentile
+from intent_matcher import IntentMatcher
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def load_labeled(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return [(row["utterance"], row["intent"], row["service"] or None) for row in csv.DictReader(f)]
+
+def evaluate(name, match, labeled, show_misses):
+    correct = 0
+    for utterance, intent, service in labeled:
+        predicted_intent, entities = match(utterance)
+        predicted = (predicted_intent, entities.get("service"))
+        if predicted == (intent, service):
+            correct += 1
+        elif show_misses:
+            print(f"  miss: {utterance!r}: got {predicted}, expected {(intent, service)}")
+    accuracy = correct / len(labeled)
+    print(f"{name:22s} accuracy {accuracy:.1%} ({correct}/{len(labeled)})")
+    return accuracy
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--labeled", default=os.path.join(HERE, "labeled_utterances.csv"))
+    parser.add_argument("--min-accuracy", type=float, default=0.9)
+    parser.add_argument("--max-p99-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    backend = load_backend()
+    labeled = load_labeled(args.labeled)
+    classifier = backend.INTENT_CLASSIFIER
+
+    matcher = IntentMatcher(backend.INTENT_KEYWORDS, backend.SERVICE_KEYWORDS)
+    evaluate("exact IntentMatcher", matcher.match, labeled, show_misses=False)
+    accuracy = evaluate("fuzzy classifier", classifier.match, labeled, show_misses=True)
+
+    samples = []
+    for _ in range(50):
+        # Clear the per-word cache so every lookup pays the full index cost
+        classifier._word_cache.clear()
+        for utterance, _, _ in labeled:
+            start = time.perf_counter()
+            classifier.rank(utterance)
+            samples.append(time.perf_counter() - start)
+    p50, p99 = percentile(samples, 50) * 1000, percentile(samples, 99) * 1000
+    print(f"fuzzy classifier latency (uncached): p50 {p50:.3f} ms, p99 {p99:.3f} ms")
+
+    if accuracy < args.min_accuracy or p99 > args.max_p99_ms:
+        print("FAILED: below accuracy or latency budget")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
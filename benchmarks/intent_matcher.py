@@ -0,0 +1,65 @@
+"""Exact keyword matcher kept as the reference for the fuzzy classifier.
+
+The backend classifies with FuzzyIntentClassifier; this is the
+single-pass exact matcher it replaced. eval_intents.py scores both on the
+labeled set, and bench_intent_matcher.py checks it against the original
+per-call regex loop.
+"""
+import re
+from typing import Dict, List, Tuple
+
+class IntentMatcher:
+    """Single-pass keyword matcher for intents and service entities.
+
+    All keywords are compiled into one alternation inside a lookahead, so a
+    single scan reports the longest keyword starting at every word boundary.
+    Each keyword maps to the best intent/service rank it implies (including
+    any shorter keywords it starts with), so the winner is the same as
+    checking each pattern in priority order.
+    """
+
+    def __init__(self, intent_keywords: Dict[str, List[str]], service_keywords: Dict[str, List[str]]):
+        self.intents = list(intent_keywords)
+        self.services = list(service_keywords)
+        no_match = len(self.intents) + len(self.services)
+
+        ranks: Dict[str, List[int]] = {}
+        for rank, intent in enumerate(self.intents):
+            for keyword in intent_keywords[intent]:
+                entry = ranks.setdefault(keyword, [no_match, no_match])
+                entry[0] = min(entry[0], rank)
+        for rank, service in enumerate(self.services):
+            for keyword in service_keywords[service]:
+                entry = ranks.setdefault(keyword, [no_match, no_match])
+                entry[1] = min(entry[1], rank)
+
+        # A longer keyword only matches where every keyword it starts with
+        # (up to a word boundary) also matches, so fold those ranks in.
+        self.keyword_ranks: Dict[str, Tuple[int, int]] = {}
+        for keyword, (intent_rank, service_rank) in ranks.items():
+            for other, (other_intent, other_service) in ranks.items():
+                if keyword.startswith(other + " "):
+                    intent_rank = min(intent_rank, other_intent)
+                    service_rank = min(service_rank, other_service)
+            self.keyword_ranks[keyword] = (intent_rank, service_rank)
+
+        alternation = "|".join(re.escape(k) for k in sorted(ranks, key=len, reverse=True))
+        self.pattern = re.compile(rf'\b(?=({alternation})\b)')
+        self.no_match = no_match
+
+    def match(self, command: str) -> Tuple[str, Dict]:
+        """Return (intent, entities) for a command in one scan"""
+        intent_rank = service_rank = self.no_match
+        keyword_ranks = self.keyword_ranks
+        for keyword in self.pattern.findall(command.lower().strip()):
+            ranks = keyword_ranks[keyword]
+            if ranks[0] < intent_rank:
+                intent_rank = ranks[0]
+            if ranks[1] < service_rank:
+                service_rank = ranks[1]
+
+        intent = self.intents[intent_rank] if intent_rank < len(self.intents) else "unknown"
+        entities = {}
+        if service_rank < len(self.services):
+            entities["service"] = self.services[service_rank]
+        return intent, entities
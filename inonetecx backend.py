@@ -1,481 +1,3268 @@
-import speech_recognition as sr #type:ignore
-import pyttsx3  #type:ignore
-import datetime
-import webbrowser
-import time
-import sys
-import json
-import logging
-from typing import Dict, List, Optional, Tuple
-import threading
-import queue
-import re
-from dataclasses import dataclass
-from enum import Enum
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('assistant.log'),
-        logging.StreamHandler()
-    ]
-)
-
-class AssistantState(Enum):
-    IDLE = "idle"
-    LISTENING = "listening"
-    PROCESSING = "processing"
-    SPEAKING = "speaking"
-
-@dataclass
-class ConversationContext:
-    last_topic: Optional[str] = None
-    follow_up_questions: List[str] = None
-    user_preferences: Dict = None
-    session_start: datetime.datetime = None
-
-class AdvancedInonetecxAssistant:
-    def __init__(self):
-        self.state = AssistantState.IDLE
-        self.conversation_history = []
-        self.context = ConversationContext(
-            session_start=datetime.datetime.now(),
-            follow_up_questions=[],
-            user_preferences={}
-        )
-        self.audio_queue = queue.Queue()
-        self.initialize_tts()
-        self.load_knowledge_base()
-        
-    def initialize_tts(self):
-        """Initialize text-to-speech with error handling"""
-        try:
-            self.engine = pyttsx3.init()
-            voices = self.engine.getProperty('voices')
-            
-            # Try to set a female voice (usually index 1)
-            if len(voices) > 1:
-                self.engine.setProperty('voice', voices[1].id)
-            else:
-                self.engine.setProperty('voice', voices[0].id)
-                
-            self.engine.setProperty('rate', 165)  # Slightly faster
-            self.engine.setProperty('volume', 0.9)
-            
-            logging.info("TTS initialized successfully")
-        except Exception as e:
-            logging.error(f"TTS initialization error: {e}")
-            sys.exit(1)
-
-    def load_knowledge_base(self):
-        """Enhanced knowledge base with more detailed information"""
-        self.knowledge_base = {
-            "company_info": {
-                "name": "Inonetecx",
-                "tagline": "Innovating Tomorrow's Technology Today",
-                "about": "Inonetecx is a cutting-edge technology solutions provider specializing in digital transformation, AI integration, and innovative software development. We empower businesses to thrive in the digital age.",
-                "services": {
-                    "web_development": {
-                        "name": "Web Development",
-                        "description": "Custom websites, e-commerce platforms, and web applications using latest technologies",
-                        "technologies": ["React", "Angular", "Node.js", "Python", "PHP"],
-                        "timeline": "2-8 weeks depending on complexity"
-                    },
-                    "mobile_development": {
-                        "name": "Mobile App Development",
-                        "description": "Native and cross-platform mobile applications for iOS and Android",
-                        "technologies": ["React Native", "Flutter", "Swift", "Kotlin"],
-                        "timeline": "6-16 weeks depending on features"
-                    },
-                    "cloud_solutions": {
-                        "name": "Cloud Computing Solutions",
-                        "description": "Cloud migration, infrastructure setup, and management services",
-                        "technologies": ["AWS", "Azure", "Google Cloud", "Docker", "Kubernetes"],
-                        "timeline": "4-12 weeks depending on scale"
-                    },
-                    "ai_ml": {
-                        "name": "AI/ML Integration",
-                        "description": "Artificial intelligence and machine learning solutions for business automation",
-                        "technologies": ["TensorFlow", "PyTorch", "OpenAI", "Hugging Face"],
-                        "timeline": "8-20 weeks depending on complexity"
-                    },
-                    "digital_marketing": {
-                        "name": "Digital Marketing Services",
-                        "description": "SEO, social media marketing, content marketing, and PPC campaigns",
-                        "technologies": ["Google Ads", "Facebook Ads", "Analytics", "SEO Tools"],
-                        "timeline": "Ongoing monthly services"
-                    },
-                    "ui_ux": {
-                        "name": "UI/UX Design",
-                        "description": "User-centered design for websites and applications",
-                        "technologies": ["Figma", "Adobe XD", "Sketch", "Photoshop"],
-                        "timeline": "3-6 weeks depending on scope"
-                    }
-                },
-                "clients": "78+ satisfied clients globally",
-                "foundation": "2023",
-                "mission": "To democratize technology and make it accessible for businesses of all sizes"
-            },
-            "pricing": {
-                "web_development": {"start": 15000, "currency": "₹", "description": "Basic website starts from"},
-                "mobile_development": {"start": 50000, "currency": "₹", "description": "Mobile app starts from"},
-                "cloud_solutions": {"start": 40000, "currency": "₹", "description": "Cloud setup starts from"},
-                "digital_marketing": {"start": 10000, "currency": "₹/month", "description": "Monthly marketing package starts from"},
-                "ai_ml": {"start": 75000, "currency": "₹", "description": "AI/ML solution starts from"},
-                "ui_ux": {"start": 20000, "currency": "₹", "description": "Design project starts from"},
-                "enterprise_solutions": "Contact for custom enterprise pricing"
-            },
-            "contact": {
-                "email": "contact@inonetecx.com",
-                "phone": "+1 647-493-5614 (Canada)",
-                "address": "180 Northfield Dr. W, unit 4 Waterloo, ON N2L 0C7, Canada",
-                "website": "https://inonetecx.com",
-                "business_hours": "Monday to Friday, 9:00 AM to 6:00 PM IST"
-            },
-            "team": {
-                "size": "25+ skilled professionals",
-                "expertise": ["Full-stack developers", "AI specialists", "Cloud architects", "UI/UX designers", "Digital marketing experts"],
-                "experience": "Average 3+ years industry experience",
-                "certifications": ["AWS Certified", "Google Cloud Professional", "Microsoft Azure Certified"]
-            },
-            "process": {
-                "consultation": "Free initial consultation to understand your requirements",
-                "planning": "Detailed project planning and timeline creation",
-                "development": "Agile development with regular updates",
-                "testing": "Comprehensive testing and quality assurance",
-                "deployment": "Smooth deployment and go-live support",
-                "maintenance": "Ongoing support and maintenance services"
-            }
-        }
-
-    def speak(self, text: str, priority: bool = False):
-        """Enhanced text-to-speech with queue management"""
-        if priority:
-            # Clear queue for priority messages
-            while not self.audio_queue.empty():
-                try:
-                    self.audio_queue.get_nowait()
-                except queue.Empty:
-                    break
-                    
-        self.audio_queue.put(text)
-        self._process_audio_queue()
-
-    def _process_audio_queue(self):
-        """Process audio queue in separate thread"""
-        def speak_text():
-            while not self.audio_queue.empty():
-                try:
-                    text = self.audio_queue.get_nowait()
-                    self.state = AssistantState.SPEAKING
-                    print(f"🤖 Assistant: {text}")
-                    self.engine.say(text)
-                    self.engine.runAndWait()
-                    self.state = AssistantState.IDLE
-                except queue.Empty:
-                    break
-                except Exception as e:
-                    logging.error(f"Speech error: {e}")
-                    
-        thread = threading.Thread(target=speak_text, daemon=True)
-        thread.start()
-
-    def listen_with_wake_word(self, wake_words: List[str] = ["hey assistant", "computer"]) -> str:
-        """Enhanced voice recognition with wake word detection"""
-        recognizer = sr.Recognizer()
-        
-        # Improved settings for better recognition
-        recognizer.energy_threshold = 300
-        recognizer.dynamic_energy_threshold = True
-        recognizer.pause_threshold = 0.8
-        recognizer.operation_timeout = 5
-        
-        for attempt in range(3):
-            try:
-                with sr.Microphone() as source:
-                    if attempt == 0:
-                        print(f"🎤 Calibrating microphone... (Attempt {attempt + 1}/3)")
-                        recognizer.adjust_for_ambient_noise(source, duration=1)
-                    
-                    print(f"🎤 Listening... (Attempt {attempt + 1}/3)")
-                    print("💡 Tip: Speak clearly and pause briefly between words")
-                    
-                    self.state = AssistantState.LISTENING
-                    audio = recognizer.listen(source, timeout=8, phrase_time_limit=10)
-                    self.state = AssistantState.PROCESSING
-                    
-                # Try multiple recognition methods
-                command = None
-                try:
-                    command = recognizer.recognize_google(audio, language='en-IN')
-                except sr.UnknownValueError:
-                    try:
-                        command = recognizer.recognize_google(audio, language='en-US')
-                    except sr.UnknownValueError:
-                        pass
-                
-                if command:
-                    print(f"👤 You: {command}")
-                    self.conversation_history.append(("user", command))
-                    return command.lower()
-                    
-            except sr.WaitTimeoutError:
-                if attempt < 2:
-                    self.speak("I didn't hear anything. Please speak now.", priority=True)
-                    time.sleep(1)
-                continue
-                
-            except sr.RequestError as e:
-                logging.error(f"Speech recognition service error: {e}")
-                if attempt < 2:
-                    self.speak("Network issue with speech service. Trying again.", priority=True)
-                    time.sleep(2)
-                continue
-                
-            except Exception as e:
-                logging.error(f"Unexpected audio error: {e}")
-                if attempt < 2:
-                    self.speak("Technical issue detected. Please try again.", priority=True)
-                    time.sleep(1)
-                continue
-        
-        self.speak("Voice recognition failed. Let me switch to text input.", priority=True)
-        try:
-            return input("👤 You (type): ").lower()
-        except KeyboardInterrupt:
-            return "exit"
-
-    def extract_intent_and_entities(self, command: str) -> Tuple[str, Dict]:
-        """Advanced intent recognition and entity extraction"""
-        command = command.lower().strip()
-        intent = "unknown"
-        entities = {}
-        
-        # Intent patterns with regex
-        intent_patterns = {
-            "greeting": r'\b(hello|hi|hey|namaste|good morning|good afternoon|good evening|hlo)\b',
-            "about_company": r'\b(about|company|introduction|tell me about|what do you do|who are you)\b',
-            "services": r'\b(services|offer|provide|work|what can you do|capabilities)\b',
-            "pricing": r'\b(price|cost|charge|how much|pricing|expensive|cheap|budget)\b',
-            "contact": r'\b(contact|reach|phone|email|address|location|get in touch)\b',
-            "team": r'\b(team|people|employees|staff|developers|how many)\b',
-            "process": r'\b(process|how do you work|methodology|approach|steps)\b',
-            "technology": r'\b(technology|tech stack|tools|programming|languages)\b',
-            "timeline": r'\b(timeline|how long|duration|time|when|deadline)\b',
-            "portfolio": r'\b(portfolio|projects|work done|examples|case studies)\b',
-            "website": r'\b(website|site|webpage|open site|show website)\b',
-            "goodbye": r'\b(bye|exit|stop|quit|thank you|thanks|goodbye|see you)\b'
-        }
-        
-        # Extract intent
-        for intent_name, pattern in intent_patterns.items():
-            if re.search(pattern, command):
-                intent = intent_name
-                break
-        
-        # Extract service entities
-        service_patterns = {
-            "web": r'\b(web|website|site)\b',
-            "mobile": r'\b(mobile|app|application|android|ios)\b',
-            "cloud": r'\b(cloud|aws|azure|server)\b',
-            "ai": r'\b(ai|artificial intelligence|machine learning|ml)\b',
-            "marketing": r'\b(marketing|seo|digital|social media)\b',
-            "design": r'\b(design|ui|ux|user interface)\b'
-        }
-        
-        for service, pattern in service_patterns.items():
-            if re.search(pattern, command):
-                entities["service"] = service
-                break
-        
-        return intent, entities
-
-    def generate_contextual_response(self, intent: str, entities: Dict, command: str) -> str:
-        """Generate intelligent, contextual responses"""
-        self.context.last_topic = intent
-        
-        if intent == "greeting":
-            current_time = datetime.datetime.now()
-            if current_time.hour < 12:
-                greeting = "Good morning!"
-            elif current_time.hour < 17:
-                greeting = "Good afternoon!"
-            else:
-                greeting = "Good evening!"
-            
-            return f"{greeting} Welcome to Inonetecx. I'm your AI assistant. How can I help you transform your business with technology today?"
-
-        elif intent == "about_company":
-            company = self.knowledge_base["company_info"]
-            return f"{company['about']} {company['tagline']}. We're founded in {company['foundation']} with a mission: {company['mission']}. Would you like to know about our specific services?"
-
-        elif intent == "services":
-            if "service" in entities:
-                service_key = f"{entities['service']}_development" if entities['service'] in ["web", "mobile"] else f"{entities['service']}_solutions" if entities['service'] == "cloud" else f"{entities['service']}_ml" if entities['service'] == "ai" else f"digital_{entities['service']}" if entities['service'] == "marketing" else f"ui_ux" if entities['service'] == "design" else entities['service']
-                
-                if service_key in self.knowledge_base["company_info"]["services"]:
-                    service = self.knowledge_base["company_info"]["services"][service_key]
-                    return f"{service['description']}. We use technologies like {', '.join(service['technologies'])}. Typical timeline is {service['timeline']}. Would you like to know about pricing?"
-                    
-            services_list = [service["name"] for service in self.knowledge_base["company_info"]["services"].values()]
-            return f"We offer comprehensive technology solutions: {', '.join(services_list)}. Which service interests you most? I can provide detailed information about any of them."
-
-        elif intent == "pricing":
-            if "service" in entities:
-                service = entities["service"]
-                if service == "web":
-                    price = self.knowledge_base["pricing"]["web_development"]
-                    return f"Our web development {price['description']} {price['currency']}{price['start']:,}. This includes responsive design, basic SEO, and 3 months free support. Shall I connect you with our team for a detailed quote?"
-                elif service == "mobile":
-                    price = self.knowledge_base["pricing"]["mobile_development"]
-                    return f"Our mobile app development {price['description']} {price['currency']}{price['start']:,}. This covers both Android and iOS with basic features. Complex apps may cost more. Would you like a free consultation?"
-                # Add more service-specific pricing...
-                    
-            pricing = self.knowledge_base["pricing"]
-            return f"Here's our starting pricing: Web Development from ₹{pricing['web_development']['start']:,}, Mobile Apps from ₹{pricing['mobile_development']['start']:,}, Cloud Solutions from ₹{pricing['cloud_solutions']['start']:,}. All projects include free consultation and post-launch support. Which service interests you?"
-
-        elif intent == "contact":
-            contact = self.knowledge_base["contact"]
-            return f"You can reach us at: 📧 Email: {contact['email']}, 📞 Phone: {contact['phone']}, 📍 Address: {contact['address']}. Our business hours are {contact['business_hours']}. Would you like me to open our website for more information?"
-
-        elif intent == "team":
-            team = self.knowledge_base["team"]
-            return f"We have {team['size']} with expertise in {', '.join(team['expertise'])}. Our team has {team['experience']} and holds certifications like {', '.join(team['certifications'])}. We follow agile methodologies and maintain high code quality standards."
-
-        elif intent == "process":
-            process = self.knowledge_base["process"]
-            steps = [f"{i+1}. {step.capitalize()}: {desc}" for i, (step, desc) in enumerate(process.items())]
-            return f"Our development process follows these steps: {' → '.join([f'{i+1}. {step.capitalize()}' for i, step in enumerate(process.keys())])}. We ensure transparency and regular communication throughout. Would you like details about any specific phase?"
-
-        elif intent == "timeline":
-            if "service" in entities:
-                service_key = f"{entities['service']}_development" if entities['service'] in ["web", "mobile"] else f"{entities['service']}_solutions"
-                if service_key in self.knowledge_base["company_info"]["services"]:
-                    timeline = self.knowledge_base["company_info"]["services"][service_key]["timeline"]
-                    return f"For {entities['service']} projects, typical timeline is {timeline}. However, exact timeline depends on your specific requirements. Shall I schedule a free consultation to give you a precise estimate?"
-                    
-            return "Project timelines vary by complexity: Web Development (2-8 weeks), Mobile Apps (6-16 weeks), Cloud Solutions (4-12 weeks), AI/ML Projects (8-20 weeks). We always provide detailed timelines after understanding your requirements."
-
-        elif intent == "website":
-            try:
-                webbrowser.open(self.knowledge_base["contact"]["website"], new=2)
-                return f"Opening our website {self.knowledge_base['contact']['website']} in your browser. You can explore our portfolio, read client testimonials, and get in touch directly through the contact form."
-            except Exception as e:
-                logging.error(f"Browser error: {e}")
-                return f"Please visit our website: {self.knowledge_base['contact']['website']} to see our portfolio and get detailed information about our services."
-
-        elif intent == "goodbye":
-            session_duration = datetime.datetime.now() - self.context.session_start
-            return f"Thank you for spending {session_duration.seconds//60} minutes with me! It was great helping you learn about Inonetecx. Feel free to contact us anytime for your technology needs. Have a wonderful day! 🚀"
-
-        else:
-            # Intelligent fallback with suggestions
-            suggestions = [
-                "our services and pricing",
-                "our development process",
-                "our team and expertise",
-                "contact information",
-                "project timelines"
-            ]
-            return f"I'd love to help you with that! I specialize in information about {', '.join(suggestions)}. You can also ask me to 'open our website' or say 'goodbye' when you're done. What would you like to know more about?"
-
-    def run_assistant(self):
-        """Main assistant loop with enhanced features"""
-        print("🚀 Initializing Advanced Inonetecx Assistant...")
-        self.speak("Initializing advanced systems...", priority=True)
-        time.sleep(1)
-        
-        print("🎤 Audio systems calibrated")
-        self.speak("Audio systems calibrated. All systems ready.", priority=True)
-        time.sleep(1)
-        
-        welcome_msg = f"Hello! I'm your intelligent Inonetecx assistant. Today is {datetime.datetime.now().strftime('%A, %B %d, %Y')}. I'm here to help you discover how we can transform your business with cutting-edge technology solutions."
-        print(f"🤖 {welcome_msg}")
-        self.speak(welcome_msg)
-        
-        print("""
-🎯 What I can help you with:
-   • Company information and our mission
-   • Detailed service descriptions and technologies
-   • Transparent pricing and project timelines  
-   • Team expertise and certifications
-   • Our proven development process
-   • Contact information and business hours
-   • Portfolio examples and client success stories
-   • Technical specifications and requirements
-
-💡 Pro tips:
-   • Speak clearly and naturally
-   • You can ask follow-up questions
-   • Say 'open website' to visit our site
-   • Say 'goodbye' when you're ready to leave
-
-🎤 Ready to listen! How can I help you today?
-        """)
-        
-        consecutive_errors = 0
-        max_errors = 3
-        
-        while True:
-            try:
-                command = self.listen_with_wake_word()
-                
-                if not command or command.strip() == "":
-                    consecutive_errors += 1
-                    if consecutive_errors >= max_errors:
-                        self.speak("I'm experiencing persistent audio issues. Please restart the assistant for the best experience.", priority=True)
-                        break
-                    self.speak("I didn't catch that. Could you please try again?", priority=True)
-                    continue
-                else:
-                    consecutive_errors = 0
-                
-                # Process command with advanced NLP
-                intent, entities = self.extract_intent_and_entities(command)
-                response = self.generate_contextual_response(intent, entities, command)
-                
-                # Add to conversation history
-                self.conversation_history.append(("assistant", response))
-                
-                # Speak response
-                self.speak(response)
-                
-                # Check for exit conditions
-                if intent == "goodbye":
-                    time.sleep(2)
-                    self.speak("Assistant shutting down. Thank you for choosing Inonetecx!", priority=True)
-                    break
-                    
-                # Suggest follow-up based on context
-                if intent in ["services", "pricing"] and len(self.conversation_history) < 10:
-                    time.sleep(1)
-                    follow_up = "Is there anything specific about this service you'd like to know more about?"
-                    self.speak(follow_up)
-                
-            except KeyboardInterrupt:
-                print("\n🛑 Assistant interrupted by user")
-                self.speak("Assistant interrupted. Goodbye!", priority=True)
-                break
-            except Exception as e:
-                logging.error(f"Unexpected error in main loop: {e}")
-                self.speak("I encountered a technical issue. Please try again or restart the assistant.", priority=True)
-                consecutive_errors += 1
-                if consecutive_errors >= max_errors:
-                    break
-
-def main():
-    """Initialize and run the advanced assistant"""
-    try:
-        assistant = AdvancedInonetecxAssistant()
-        assistant.run_assistant()
-    except KeyboardInterrupt:
-        print("\nProgram terminated by user. Goodbye! 👋")
-    except Exception as e:
-        logging.critical(f"Critical error: {e}")
-        print(f"Critical error occurred: {e}")
-        print("Please check the logs and restart the application.")
-
-if __name__ == "__main__":
+import importlib
+import datetime
+import webbrowser
+import time
+import sys
+import argparse
+import asyncio
+import json
+import logging
+import atexit
+import bisect
+import heapq
+import csv
+import hashlib
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import threading
+import queue
+import re
+import os
+import shutil
+import sqlite3
+import struct
+import subprocess
+import uuid
+import math
+import wave
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import dataclasses
+from dataclasses import dataclass
+from enum import Enum
+
+class LazyModule:
+    """Module proxy that imports on first attribute access.
+
+    The audio stacks are slow to import and unused by the text pipeline,
+    so server and batch modes never load them.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+sr = LazyModule("speech_recognition")
+pyttsx3 = LazyModule("pyttsx3")
+
+# Configure logging: callers only enqueue records, a background thread
+# does the file and console I/O
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler('assistant.log'), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_queue_handler = QueueHandler(_log_queue)
+# The target handlers do the real formatting
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+class Metrics:
+    """Thread-safe counters, gauges and per-stage latency histograms.
+
+    Exported as Prometheus text (GET /metrics in server mode) or as a
+    JSON snapshot that can be dumped to a file periodically.
+    """
+
+    BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, prefix: str = "inonetecx"):
+        self.prefix = prefix
+        self.counters: Dict[Tuple[str, Tuple], float] = {}
+        self.gauges: Dict[Tuple[str, Tuple], float] = {}
+        # stage -> [bucket counts..., +Inf count, sum, max]
+        self.timings: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())) if labels else ())
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.gauges[key] = value
+
+    def observe(self, stage: str, seconds: float):
+        index = bisect.bisect_left(self.BUCKETS, seconds)
+        with self._lock:
+            timing = self.timings.get(stage)
+            if timing is None:
+                timing = self.timings[stage] = [0] * (len(self.BUCKETS) + 1) + [0.0, 0.0]
+            timing[index] += 1
+            timing[-2] += seconds
+            if seconds > timing[-1]:
+                timing[-1] = seconds
+
+    @contextmanager
+    def span(self, stage: str):
+        """Time the body of a with-block as one observation of a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict:
+        """JSON-friendly view of every metric"""
+        def label_key(name, labels):
+            return name + ("{" + ",".join(f"{k}={v}" for k, v in labels) + "}" if labels else "")
+
+        with self._lock:
+            stages = {}
+            for stage, timing in self.timings.items():
+                count = sum(timing[:-2])
+                stages[stage] = {
+                    "count": count,
+                    "mean_ms": round(timing[-2] / count * 1000, 3) if count else 0.0,
+                    "max_ms": round(timing[-1] * 1000, 3)
+                }
+            return {
+                "timestamp": time.time(),
+                "counters": {label_key(n, l): v for (n, l), v in self.counters.items()},
+                "gauges": {label_key(n, l): v for (n, l), v in self.gauges.items()},
+                "stages": stages
+            }
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        def labels_text(labels):
+            return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}" if labels else ""
+
+        lines = []
+        with self._lock:
+            for kind, values in (("counter", self.counters), ("gauge", self.gauges)):
+                seen = set()
+                for (name, labels), value in sorted(values.items()):
+                    metric = f"{self.prefix}_{name}"
+                    if metric not in seen:
+                        lines.append(f"# TYPE {metric} {kind}")
+                        seen.add(metric)
+                    lines.append(f"{metric}{labels_text(labels)} {value}")
+
+            metric = f"{self.prefix}_stage_duration_seconds"
+            if self.timings:
+                lines.append(f"# TYPE {metric} histogram")
+            for stage, timing in sorted(self.timings.items()):
+                cumulative = 0
+                for bound, count in zip(self.BUCKETS + ("+Inf",), timing[:-2]):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{stage="{stage}"}} {timing[-2]}')
+                lines.append(f'{metric}_count{{stage="{stage}"}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str):
+        """Atomically replace a file with snapshot()"""
+        try:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.error(f"Metrics dump failed: {e}")
+
+    def start_json_dump(self, path: str, interval: float = 30.0) -> threading.Thread:
+        """Write snapshot() to a file every interval seconds"""
+        def dump():
+            while True:
+                time.sleep(interval)
+                self.write_json(path)
+
+        thread = threading.Thread(target=dump, name="metrics-dump", daemon=True)
+        thread.start()
+        return thread
+
+METRICS = Metrics()
+
+class AssistantState(Enum):
+    IDLE = "idle"
+    LISTENING = "listening"
+    PROCESSING = "processing"
+    SPEAKING = "speaking"
+
+@dataclass
+class ConversationContext:
+    last_topic: Optional[str] = None
+    follow_up_questions: List[str] = None
+    user_preferences: Dict = None
+    session_start: datetime.datetime = None
+    # Rolling summary of turns evicted from the bounded history
+    topic_summary: Dict[str, int] = None
+    service_summary: Dict[str, int] = None
+    summarized_turns: int = 0
+
+    def __post_init__(self):
+        if self.topic_summary is None:
+            self.topic_summary = {}
+        if self.service_summary is None:
+            self.service_summary = {}
+
+    def summarize(self, turn: "ConversationTurn"):
+        """Fold an evicted user turn into the per-topic counts"""
+        if turn.role != "user":
+            return
+        self.summarized_turns += 1
+        if turn.intent:
+            self.topic_summary[turn.intent] = self.topic_summary.get(turn.intent, 0) + 1
+        if turn.entity:
+            self.service_summary[turn.entity] = self.service_summary.get(turn.entity, 0) + 1
+
+class ConversationTurn:
+    """One user or assistant message in the history"""
+
+    __slots__ = ("role", "text", "timestamp", "intent", "entity")
+
+    def __init__(self, role: str, text: str, intent: Optional[str] = None,
+                 entity: Optional[str] = None, timestamp: Optional[float] = None):
+        self.role = role
+        self.text = text
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.intent = intent
+        self.entity = entity
+
+    def __repr__(self) -> str:
+        return f"ConversationTurn({self.role!r}, {self.text!r}, intent={self.intent!r}, entity={self.entity!r})"
+
+class ConversationHistory:
+    """Fixed-capacity ring buffer of ConversationTurn records.
+
+    add() returns the turn that was evicted to make room, if any, so the
+    caller can fold it into a summary. total_turns counts every turn ever
+    added, including evicted ones.
+    """
+
+    def __init__(self, capacity: int = 50):
+        self.turns: deque = deque()
+        self.capacity = capacity
+        self.total_turns = 0
+
+    def add(self, role: str, text: str, intent: Optional[str] = None,
+            entity: Optional[str] = None) -> Optional[ConversationTurn]:
+        return self.append(ConversationTurn(role, text, intent, entity))
+
+    def append(self, turn: ConversationTurn) -> Optional[ConversationTurn]:
+        evicted = self.turns.popleft() if len(self.turns) >= self.capacity else None
+        self.turns.append(turn)
+        self.total_turns += 1
+        return evicted
+
+    def last(self, role: Optional[str] = None) -> Optional[ConversationTurn]:
+        """Most recent turn, optionally only from one role"""
+        for turn in reversed(self.turns):
+            if role is None or turn.role == role:
+                return turn
+        return None
+
+    def clear(self):
+        self.turns.clear()
+        self.total_turns = 0
+
+    def __len__(self) -> int:
+        return len(self.turns)
+
+    def __iter__(self) -> Iterator[ConversationTurn]:
+        return iter(self.turns)
+
+class StateWriter:
+    """Builds the compact binary session state: struct fields and
+    length-prefixed UTF-8 strings (a length of 0xFFFFFFFF is None)"""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+
+    def pack(self, fmt: str, *values):
+        self.parts.append(struct.pack(fmt, *values))
+
+    def text(self, value: Optional[str]):
+        if value is None:
+            self.parts.append(b"\xff\xff\xff\xff")
+            return
+        encoded = value.encode("utf-8")
+        self.parts.append(struct.pack("<I", len(encoded)))
+        self.parts.append(encoded)
+
+    def getvalue(self) -> bytes:
+        return b"".join(self.parts)
+
+class StateReader:
+    """Reads what StateWriter wrote, in the same order"""
+
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def unpack(self, fmt: str) -> Tuple:
+        values = struct.unpack_from(fmt, self.data, self.offset)
+        self.offset += struct.calcsize(fmt)
+        return values
+
+    def text(self) -> Optional[str]:
+        (length,) = self.unpack("<I")
+        if length == 0xFFFFFFFF:
+            return None
+        value = str(self.data[self.offset:self.offset + length], "utf-8")
+        self.offset += length
+        return value
+
+# Intent keywords in priority order: equal scores go to the earlier intent
+INTENT_KEYWORDS: Dict[str, List[str]] = {
+    "greeting": ["hello", "hi", "hey", "namaste", "good morning", "good afternoon", "good evening", "hlo"],
+    "about_company": ["about", "company", "introduction", "tell me about", "what do you do", "who are you"],
+    "services": ["services", "offer", "provide", "work", "what can you do", "capabilities", "development", "develop"],
+    "pricing": ["price", "cost", "charge", "how much", "pricing", "expensive", "cheap", "budget"],
+    "contact": ["contact", "reach", "phone", "email", "address", "location", "get in touch"],
+    "team": ["team", "people", "employees", "staff", "developers", "how many"],
+    "process": ["process", "development process", "how do you work", "methodology", "approach", "steps"],
+    "technology": ["technology", "tech stack", "tools", "programming", "languages"],
+    "timeline": ["timeline", "how long", "how much time", "duration", "time", "when", "deadline"],
+    # "projects" alone would also catch "how long will my project take"
+    "portfolio": ["portfolio", "your projects", "past projects", "previous projects", "projects you",
+                  "projects have you", "work done", "examples", "case studies"],
+    "website": ["website", "site", "webpage", "open site", "show website"],
+    "goodbye": ["bye", "exit", "stop", "quit", "thank you", "thanks", "goodbye", "see you"]
+}
+
+# Generic lead-ins that only decide the intent when no topic keyword matches
+# ("tell me about your pricing" is pricing)
+LEAD_IN_KEYWORDS = {"about", "tell me about"}
+
+# Service entity keywords in priority order
+SERVICE_KEYWORDS: Dict[str, List[str]] = {
+    "web": ["web", "website", "site"],
+    "mobile": ["mobile", "app", "application", "android", "ios"],
+    "cloud": ["cloud", "aws", "azure", "server"],
+    "ai": ["ai", "artificial intelligence", "machine learning", "ml"],
+    "marketing": ["marketing", "seo", "digital", "social media"],
+    "design": ["design", "ui", "ux", "user interface"]
+}
+
+class FuzzyIntentClassifier:
+    """Typo-tolerant intent and service classifier over character trigrams.
+
+    The distinct words of all keywords are indexed by trigram once. Each
+    input word is looked up in that inverted index and scored by Dice
+    similarity, so "pricng" still matches "pricing". Only misspellings
+    count: a word that is itself a keyword word matches just that word,
+    long words and words of quite different length need a closer match
+    ("sign" is not "design"), and inflections of one stem never match
+    ("serve"/"server", "developed"/"developer"). Multi-word keywords
+    match when consecutive input words match their words in order. A match
+    scores its mean similarity times its word count, and longer matches
+    hide shorter ones they overlap ("how much time" beats "how much").
+    Generic lead-ins ("tell me about") score LEAD_IN_SCORE at most, so
+    they only win when no topic keyword matched. Intents are ranked by total score; ties go to the earlier intent in
+    INTENT_KEYWORDS, as with a first-hit keyword scan.
+    """
+
+    TOKEN = re.compile(r"[a-z0-9]+")
+    # Endings that turn one real word into another rather than a typo of it
+    INFLECTIONS = ("ment", "ers", "ing", "er", "ed", "r", "d")
+    # Words this long need a closer match
+    LONG_WORD = 9
+    LONG_WORD_SIMILARITY = 0.7
+    # So do words whose lengths differ this much ("sign" vs "design")
+    UNEVEN_LENGTH = 2
+    UNEVEN_LENGTH_SIMILARITY = 0.65
+    # Where a compound question splits into separately answered clauses
+    CLAUSE_BOUNDARY = re.compile(r"[,;?!]|\.(?:\s|$)|\b(?:and|also|plus|then|as well as)\b")
+    CACHE_SIZE = 4096
+    MAX_INTENTS = 3
+    # Score of a full lead-in match, below any single topic word
+    LEAD_IN_SCORE = 0.5
+
+    def __init__(self, intent_keywords: Dict[str, List[str]], service_keywords: Dict[str, List[str]],
+                 min_similarity: float = 0.6, lead_ins: Iterable[str] = ()):
+        self.min_similarity = min_similarity
+        self.labels = (list(intent_keywords), list(service_keywords))
+        self.vocabulary: List[str] = []
+        self._vocabulary_ids: Dict[str, int] = {}
+        self.vocabulary_grams: List[int] = []
+        self.index: Dict[str, List[int]] = {}
+        # first keyword word -> [(kind, label rank, remaining words, score per similarity)]
+        self.keywords_by_first_word: Dict[str, List[Tuple[int, int, Tuple[str, ...], float]]] = {}
+        self._word_cache: Dict[str, Dict[str, float]] = {}
+
+        for kind, keywords in enumerate((intent_keywords, service_keywords)):
+            for rank, label in enumerate(keywords):
+                for keyword in keywords[label]:
+                    words = self._normalize(keyword)
+                    for word in words:
+                        self._add_word(word)
+                    weight = self.LEAD_IN_SCORE / len(words) if keyword in lead_ins else 1.0
+                    self.keywords_by_first_word.setdefault(words[0], []).append((kind, rank, tuple(words[1:]), weight))
+
+    def _add_word(self, word: str):
+        if word in self._vocabulary_ids:
+            return
+        word_id = len(self.vocabulary)
+        grams = self._trigrams(word)
+        self._vocabulary_ids[word] = word_id
+        self.vocabulary.append(word)
+        self.vocabulary_grams.append(len(grams))
+        for gram in grams:
+            self.index.setdefault(gram, []).append(word_id)
+
+    @classmethod
+    def _normalize(cls, text: str) -> List[str]:
+        """Lowercase words with a plural 's' stripped ("apps" -> "app")"""
+        return [w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w
+                for w in cls.TOKEN.findall(text.lower())]
+
+    @staticmethod
+    def _trigrams(word: str) -> set:
+        padded = f"#{word}#"
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    @classmethod
+    def _stem(cls, word: str) -> str:
+        for suffix in cls.INFLECTIONS:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+                return word[:-len(suffix)]
+        return word
+
+    @classmethod
+    def _is_inflection(cls, word: str, other: str) -> bool:
+        """Different forms of one word, e.g. serve/server or developed/developer"""
+        shorter, longer = sorted((word, other), key=len)
+        if longer.startswith(shorter) and longer[len(shorter):] in cls.INFLECTIONS:
+            return True
+        return cls._stem(word) == cls._stem(other)
+
+    def _similar_words(self, word: str) -> Dict[str, float]:
+        """Vocabulary words similar to an input word, with their similarity"""
+        cached = self._word_cache.get(word)
+        if cached is not None:
+            return cached
+        if word in self._vocabulary_ids:
+            similar = {word: 1.0}
+        else:
+            similar = self._misspelled(word)
+        if len(self._word_cache) >= self.CACHE_SIZE:
+            self._word_cache.clear()
+        self._word_cache[word] = similar
+        return similar
+
+    def _misspelled(self, word: str) -> Dict[str, float]:
+        """Vocabulary words an unknown word is a likely typo of"""
+        grams = self._trigrams(word)
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for word_id in self.index.get(gram, ()):
+                shared[word_id] = shared.get(word_id, 0) + 1
+        similar = {}
+        for word_id, count in shared.items():
+            candidate = self.vocabulary[word_id]
+            similarity = 2 * count / (len(grams) + self.vocabulary_grams[word_id])
+            threshold = self.min_similarity
+            if max(len(word), len(candidate)) >= self.LONG_WORD:
+                threshold = max(threshold, self.LONG_WORD_SIMILARITY)
+            if abs(len(word) - len(candidate)) >= self.UNEVEN_LENGTH:
+                threshold = max(threshold, self.UNEVEN_LENGTH_SIMILARITY)
+            if similarity < threshold or self._is_inflection(word, candidate):
+                continue
+            similar[candidate] = similarity
+        return similar
+
+    def _matches(self, words: List[str]) -> List[Tuple[float, int, int, int, int]]:
+        """Candidate (score, kind, rank, start, end) keyword matches"""
+        similar = [self._similar_words(word) for word in words]
+        matches = []
+        for start, candidates in enumerate(similar):
+            for first_word, first_similarity in candidates.items():
+                for kind, rank, rest, weight in self.keywords_by_first_word.get(first_word, ()):
+                    end = start + 1 + len(rest)
+                    if end > len(words):
+                        continue
+                    total = first_similarity
+                    for offset, keyword_word in enumerate(rest, start + 1):
+                        similarity = similar[offset].get(keyword_word)
+                        if similarity is None:
+                            break
+                        total += similarity
+                    else:
+                        # mean similarity times word count, scaled down for lead-ins
+                        matches.append((total * weight, kind, rank, start, end))
+        return matches
+
+    def rank(self, command: str, services_first: bool = False) -> Tuple[List[Tuple[str, float]], List[Tuple[str, float]]]:
+        """(intents, services) ranked best first with confidence in 0..1.
+
+        With services_first, words that name a service don't also count as
+        an intent keyword ("website" is then web, not the website intent).
+        """
+        scores: Tuple[Dict[int, float], Dict[int, float]] = ({}, {})
+        taken: Tuple[List[Tuple[int, int]], List[Tuple[int, int]]] = ([], [])
+        matches = self._matches(self._normalize(command))
+        order = (lambda m: (-m[1], -m[0], m[2])) if services_first else (lambda m: (-m[0], m[2]))
+        for score, kind, rank, start, end in sorted(matches, key=order):
+            if any(start < other_end and other_start < end for other_start, other_end in taken[kind]):
+                continue
+            if services_first and kind == 0 and any(other_start <= start and end <= other_end
+                                                    for other_start, other_end in taken[1]):
+                continue
+            taken[kind].append((start, end))
+            scores[kind][rank] = scores[kind].get(rank, 0.0) + score
+
+        ranked = []
+        for kind in (0, 1):
+            total = sum(scores[kind].values())
+            ordered = sorted(scores[kind].items(), key=lambda item: (-item[1], item[0]))
+            ranked.append([(self.labels[kind][rank], round(score / total, 3)) for rank, score in ordered])
+        return ranked[0], ranked[1]
+
+    def match(self, command: str, services_first: bool = False) -> Tuple[str, Dict]:
+        """Best (intent, entities), e.g. ("pricing", {"service": "web"})"""
+        intents, services = self.rank(command, services_first)
+        entities = {"service": services[0][0]} if services else {}
+        return (intents[0][0] if intents else "unknown"), entities
+
+    def match_all(self, command: str) -> List[Tuple[str, Dict]]:
+        """Every (intent, entities) pair of a compound question, in the order asked.
+
+        Each clause is matched on its own. A clause that names only a
+        service ("web and mobile pricing") adds that service to the nearest
+        intent, and a clause without a service takes the one mentioned
+        around it ("web prices and how long does it take"). A clause that
+        matches nothing is kept as ("unknown", {"question": clause}) after
+        the matched intents, so it can still be answered from the knowledge
+        base while the first pair stays a real intent.
+        """
+        parts = [clause for clause in self.CLAUSE_BOUNDARY.split(command) if self.TOKEN.search(clause.lower())]
+        if len(parts) <= 1:
+            return [self.match(command)]
+        clauses = [self.match(clause, services_first=True) for clause in parts]
+        if all(intent == "unknown" for intent, _ in clauses):
+            return [next(((i, e) for i, e in clauses if e), clauses[0])]
+
+        pairs: List[List] = []
+        pending: List[str] = []
+        for clause, (intent, entities) in zip(parts, clauses):
+            service = entities.get("service")
+            if intent == "unknown":
+                if service is None:
+                    pairs.append([intent, None, clause.strip()])
+                    continue
+                if pairs:
+                    pairs.append([pairs[-1][0], service])
+                else:
+                    pending.append(service)
+                continue
+            pairs.extend([intent, pending_service] for pending_service in pending)
+            if service is not None or not pending:
+                pairs.append([intent, service])
+            pending = []
+
+        # Clauses without a service refer to the one mentioned before them,
+        # or failing that the first one mentioned after
+        known = [service for _, service, *_ in pairs if service is not None]
+        previous = known[0] if known else None
+        for pair in pairs:
+            if len(pair) > 2:
+                continue
+            if pair[1] is None:
+                pair[1] = previous
+            previous = pair[1]
+
+        merged: List[Tuple[str, Dict]] = []
+        for intent, service, *question in sorted(pairs, key=lambda pair: len(pair) > 2):
+            pair = (intent, {"question": question[0]} if question else {"service": service} if service else {})
+            if pair not in merged:
+                merged.append(pair)
+        return merged[:self.MAX_INTENTS]
+
+INTENT_CLASSIFIER = FuzzyIntentClassifier(INTENT_KEYWORDS, SERVICE_KEYWORDS, lead_ins=LEAD_IN_KEYWORDS)
+
+# Matcher service entities -> keys under company_info.services and pricing
+SERVICE_ENTITY_KEYS = {
+    "web": "web_development",
+    "mobile": "mobile_development",
+    "cloud": "cloud_solutions",
+    "ai": "ai_ml",
+    "marketing": "digital_marketing",
+    "design": "ui_ux"
+}
+
+KNOWLEDGE_BASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "knowledge_base.json")
+
+_numpy = None
+
+def optional_numpy():
+    """NumPy when installed, else None; retrieval then runs in pure Python"""
+    global _numpy
+    if _numpy is None:
+        try:
+            _numpy = importlib.import_module("numpy")
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+class PassageIndex:
+    """TF-IDF index over short passages for top-k cosine similarity search.
+
+    Weights are stored per term (posting lists of passage ids and weights),
+    so memory grows with the terms of each passage rather than passages x
+    vocabulary. With NumPy the postings are flat arrays and a query is one
+    weighted bincount over the slices of its terms plus an argpartition;
+    without it the same sums run over a dict.
+    """
+
+    TOKEN = re.compile(r"[a-z0-9]+")
+    STOPWORDS = frozenset(
+        "a an and are as at be by can could do does did for from have has how i in is it me my of on or our "
+        "please tell that the this to us we what when where which who why will with would you your".split()
+    )
+    # Shorter tokens are contraction debris ("what's" -> "s"), not words
+    MIN_TERM_LENGTH = 2
+    # Longer queries keep their rarest terms, which bounds search time
+    MAX_QUERY_TERMS = 16
+
+    def __init__(self, texts: List[str], use_numpy: Optional[bool] = None):
+        self.size = len(texts)
+        counts = [self._term_counts(text) for text in texts]
+        document_frequency: Dict[str, int] = {}
+        for terms in counts:
+            for term in terms:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+        self.idf = {term: math.log((1 + self.size) / (1 + df)) + 1 for term, df in document_frequency.items()}
+
+        # (term, passage, weight) triples of the L2-normalized TF-IDF vectors
+        self.term_ids: Dict[str, int] = {term: i for i, term in enumerate(self.idf)}
+        triple_terms: List[int] = []
+        triple_passages: List[int] = []
+        triple_weights: List[float] = []
+        for passage_id, terms in enumerate(counts):
+            weights = {term: (1 + math.log(tf)) * self.idf[term] for term, tf in terms.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for term, weight in weights.items():
+                triple_terms.append(self.term_ids[term])
+                triple_passages.append(passage_id)
+                triple_weights.append(weight / norm)
+
+        np = optional_numpy() if use_numpy is not False else None
+        if use_numpy and np is None:
+            raise ImportError("numpy is not installed")
+        self.np = np
+        if np is None:
+            self.postings: List[Tuple[List[int], List[float]]] = [([], []) for _ in self.term_ids]
+            for term_id, passage_id, weight in zip(triple_terms, triple_passages, triple_weights):
+                ids, values = self.postings[term_id]
+                ids.append(passage_id)
+                values.append(weight)
+            return
+        # CSC-style layout: the postings of term t are ids/weights[offsets[t]:offsets[t + 1]]
+        terms = np.array(triple_terms, dtype=np.int32)
+        order = np.argsort(terms, kind="stable")
+        self.ids = np.array(triple_passages, dtype=np.int32)[order]
+        self.weights = np.array(triple_weights, dtype=np.float32)[order]
+        self.offsets = np.zeros(len(self.term_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(self.term_ids)), out=self.offsets[1:])
+
+    @classmethod
+    def _term_counts(cls, text: str) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for word in cls.TOKEN.findall(text.lower()):
+            if len(word) < cls.MIN_TERM_LENGTH or word in cls.STOPWORDS:
+                continue
+            # Same plural folding as the intent classifier
+            if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+                word = word[:-1]
+            counts[word] = counts.get(word, 0) + 1
+        return counts
+
+    def _query_weights(self, query: str) -> Dict[str, float]:
+        weights = {term: (1 + math.log(tf)) * self.idf[term]
+                   for term, tf in self._term_counts(query).items() if term in self.idf}
+        if len(weights) > self.MAX_QUERY_TERMS:
+            weights = dict(sorted(weights.items(), key=lambda item: -item[1])[:self.MAX_QUERY_TERMS])
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {term: weight / norm for term, weight in weights.items()}
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[float, int]]:
+        """Top-k (cosine similarity, passage id), best first; only positive scores"""
+        weights = self._query_weights(query)
+        if not weights or not self.size:
+            return []
+        if self.np is None:
+            scores: Dict[int, float] = {}
+            for term, query_weight in weights.items():
+                ids, values = self.postings[self.term_ids[term]]
+                for passage_id, value in zip(ids, values):
+                    scores[passage_id] = scores.get(passage_id, 0.0) + value * query_weight
+            return [(score, passage_id) for passage_id, score in
+                    heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))]
+
+        np = self.np
+        slices = []
+        for term, query_weight in weights.items():
+            term_id = self.term_ids[term]
+            slices.append((self.offsets[term_id], self.offsets[term_id + 1], query_weight))
+        ids = np.concatenate([self.ids[start:end] for start, end, _ in slices])
+        values = np.concatenate([self.weights[start:end] * query_weight for start, end, query_weight in slices])
+        scores = np.bincount(ids, weights=values, minlength=self.size)
+        k = min(k, self.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(float(scores[i]), int(i)) for i in top if scores[i] > 0]
+
+# Fields of a described record that only make sense read together
+RECORD_FIELDS = ("description", "start", "currency")
+
+def knowledge_base_passages(data, title: str = "") -> Iterator[Tuple[str, str]]:
+    """Flatten the knowledge base into (title, text) passages.
+
+    A record with a "description" (a service or a price) yields its
+    description with the price folded in ("Cloud setup starts from
+    ₹40,000"), then its remaining fields as passages of their own, so a
+    technology name still lands in a short, specific passage. Any other
+    text leaf or list of strings is one passage. Titles name the nearest
+    enclosing record by its "name" ("Web Development"), else the key path.
+    Leaves without a word in them are dropped.
+    """
+    for key, value in data.items():
+        if key == "name":
+            continue
+        label = key.replace("_", " ")
+        if isinstance(value, dict):
+            record_title = value.get("name") or f"{title} {label}".strip()
+            if isinstance(value.get("description"), str):
+                yield record_title, _record_text(value)
+                value = {field: item for field, item in value.items() if field not in RECORD_FIELDS}
+            yield from knowledge_base_passages(value, record_title)
+            continue
+        if isinstance(value, list):
+            text = ", ".join(str(item) for item in value if isinstance(item, (str, int, float)))
+        elif isinstance(value, str):
+            text = value
+        else:
+            continue
+        if PassageIndex.TOKEN.search(text.lower()):
+            yield f"{title} {label}".strip(), text
+
+def _record_text(record: Dict) -> str:
+    """A record's description with its starting price, if it has one"""
+    text = record["description"]
+    if isinstance(record.get("start"), (int, float)):
+        symbol, _, per = record.get("currency", "").partition("/")
+        text += f" {symbol}{record['start']:,}" + (f"/{per}" if per else "")
+    return text
+
+class KnowledgeBase:
+    """Read-only knowledge base snapshot with lookup indexes built at load time"""
+
+    def __init__(self, data: Dict):
+        self.data = data
+        services = data["company_info"]["services"]
+        pricing = data["pricing"]
+        self.services_by_entity = {
+            entity: services[key] for entity, key in SERVICE_ENTITY_KEYS.items() if key in services
+        }
+        self.pricing_by_entity = {
+            entity: pricing[key] for entity, key in SERVICE_ENTITY_KEYS.items() if isinstance(pricing.get(key), dict)
+        }
+        self.service_names = [service["name"] for service in services.values()]
+        self.service_names_text = ", ".join(self.service_names)
+        self.passages = list(knowledge_base_passages(data))
+        self.passage_index = PassageIndex([f"{title} {text}" for title, text in self.passages])
+
+    def retrieve(self, query: str, k: int = 3) -> List[Tuple[float, str, str]]:
+        """Passages most similar to the query as (score, title, text), best first"""
+        return [(score, *self.passages[i]) for score, i in self.passage_index.search(query, k)]
+
+    @classmethod
+    def from_file(cls, path: str) -> "KnowledgeBase":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+class KnowledgeBaseStore:
+    """Holds the current KnowledgeBase and reloads it when the file changes.
+
+    A reload builds a complete new snapshot and then swaps the reference,
+    so readers see either the old or the new knowledge base, never a mix.
+    A file that fails to load is logged and the previous snapshot is kept.
+    """
+
+    def __init__(self, path: str = KNOWLEDGE_BASE_PATH):
+        self.path = path
+        self._signature = self._stat()
+        self.current = KnowledgeBase.from_file(path)
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def reload_if_changed(self) -> bool:
+        """Reload the file if its mtime or size changed; returns True on swap"""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+        try:
+            snapshot = KnowledgeBase.from_file(self.path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.error(f"Knowledge base reload failed, keeping previous version: {e}")
+            return False
+        self.current = snapshot
+        logging.info(f"Knowledge base reloaded from {self.path}")
+        return True
+
+    def watch(self, interval: float = 2.0):
+        """Poll the file for changes in a background thread"""
+        if self._watcher is not None:
+            return
+
+        def poll():
+            while not self._stop.wait(interval):
+                self.reload_if_changed()
+
+        self._watcher = threading.Thread(target=poll, name="kb-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+
+_default_store: Optional[KnowledgeBaseStore] = None
+_default_store_lock = threading.Lock()
+
+def default_knowledge_base_store(path: Optional[str] = None) -> KnowledgeBaseStore:
+    """Knowledge base store shared by every session in this process.
+
+    The path is only used by the first call; later calls return the same store.
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = KnowledgeBaseStore(path or os.environ.get("INONETECX_KNOWLEDGE_BASE", KNOWLEDGE_BASE_PATH))
+        return _default_store
+
+# Sentence ends: . ! or ? after a lowercase word, number or acronym, so
+# "Dr. W" and the "1. Consultation" step numbers are not split
+SENTENCE_BOUNDARY = re.compile(r'(?:(?<=[a-z0-9)]{2}[.!?])|(?<=[A-Z]{3}[.!?]))\s+')
+WORD_CHAR = re.compile(r'\w')
+
+def split_sentences(text: str) -> Iterator[str]:
+    """Yield sentence-sized chunks of a response in order"""
+    start = 0
+    for match in SENTENCE_BOUNDARY.finditer(text):
+        if not WORD_CHAR.search(text, match.end()):
+            # Keep a trailing emoji with the last sentence
+            break
+        yield text[start:match.start()]
+        start = match.end()
+    if start < len(text):
+        yield text[start:]
+
+# Unknown-intent questions are answered from the best knowledge base
+# passage when its cosine similarity reaches RETRIEVAL_MIN_SCORE; a search
+# slower than RETRIEVAL_BUDGET seconds is logged and counted
+RETRIEVAL_MIN_SCORE = 0.25
+RETRIEVAL_BUDGET = 0.005
+
+# Responses with side effects or per-session data are never cached, nor
+# unknown-intent ones, the only intent answered by per-question retrieval
+UNCACHED_INTENTS = {"website", "goodbye", "unknown"}
+
+def time_bucket(now: Optional[datetime.datetime] = None) -> str:
+    """Part of the day used by the greeting: morning, afternoon or evening"""
+    hour = (now or datetime.datetime.now()).hour
+    if hour < 12:
+        return "morning"
+    elif hour < 17:
+        return "afternoon"
+    return "evening"
+
+class ResponseCache:
+    """Thread-safe LRU cache of rendered responses.
+
+    Entries belong to one knowledge base snapshot; looking up with a
+    different (e.g. reloaded) snapshot clears the cache. Call invalidate()
+    after mutating a knowledge base in place.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.entries: "OrderedDict[Tuple, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._knowledge_base: Optional["KnowledgeBase"] = None
+        self._lock = threading.Lock()
+
+    def _bind(self, knowledge_base: "KnowledgeBase"):
+        if knowledge_base is not self._knowledge_base:
+            self.entries.clear()
+            self._knowledge_base = knowledge_base
+
+    def get(self, knowledge_base: "KnowledgeBase", key: Tuple) -> Optional[str]:
+        with self._lock:
+            self._bind(knowledge_base)
+            response = self.entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, knowledge_base: "KnowledgeBase", key: Tuple, response: str):
+        with self._lock:
+            self._bind(knowledge_base)
+            self.entries[key] = response
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self):
+        with self._lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+RESPONSE_CACHE = ResponseCache()
+
+# Fixed lines of the voice loop; their audio is synthesized once and cached
+VOICE_PROMPTS = {
+    "boot": "Initializing advanced systems. All systems ready.",
+    "no_speech": "I didn't hear anything. Please speak now.",
+    "network_error": "Network issue with speech service. Trying again.",
+    "audio_error": "Technical issue detected. Please try again.",
+    "text_fallback": "Voice recognition failed. Let me switch to text input.",
+    "persistent_errors": "I'm experiencing persistent audio issues. Please restart the assistant for the best experience.",
+    "not_understood": "I didn't catch that. Could you please try again?",
+    "shutdown": "Assistant shutting down. Thank you for choosing Inonetecx!",
+    "follow_up": "Is there anything specific about this service you'd like to know more about?",
+    "interrupted": "Assistant interrupted. Goodbye!",
+    "technical_issue": "I encountered a technical issue. Please try again or restart the assistant.",
+}
+
+def create_tts_engine():
+    """Create and configure a pyttsx3 engine"""
+    engine = pyttsx3.init()
+    voices = engine.getProperty('voices')
+
+    # Try to set a female voice (usually index 1)
+    if len(voices) > 1:
+        engine.setProperty('voice', voices[1].id)
+    else:
+        engine.setProperty('voice', voices[0].id)
+
+    engine.setProperty('rate', 165)  # Slightly faster
+    engine.setProperty('volume', 0.9)
+    return engine
+
+class FakeTTSEngine:
+    """Headless stand-in for a pyttsx3 engine that records what it says.
+
+    Words are "spoken" one at a time (optionally with a delay) and the
+    started-word callbacks fire like the real engine, so interruption via
+    stop() behaves the same way.
+    """
+
+    def __init__(self, word_delay: float = 0.0):
+        self.word_delay = word_delay
+        self.properties = {'voices': [], 'rate': 200, 'volume': 1.0, 'voice': None}
+        self.callbacks: Dict[str, List[Callable]] = {}
+        self.pending: List[str] = []
+        self.pending_files: List[Tuple[str, str]] = []
+        self.spoken: List[str] = []
+        self.interrupted: List[str] = []
+        self._stopped = False
+
+    def getProperty(self, name: str):
+        return self.properties.get(name)
+
+    def setProperty(self, name: str, value):
+        self.properties[name] = value
+
+    def connect(self, topic: str, callback: Callable):
+        self.callbacks.setdefault(topic, []).append(callback)
+
+    def say(self, text: str, name: Optional[str] = None):
+        self.pending.append(text)
+
+    def save_to_file(self, text: str, filename: str):
+        self.pending_files.append((text, filename))
+
+    def stop(self):
+        self._stopped = True
+
+    def runAndWait(self):
+        self._stopped = False
+        for text, filename in self.pending_files:
+            # Silence, a tenth of a second per word
+            with wave.open(filename, "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(16000)
+                wav.writeframes(b"\0\0" * 1600 * len(text.split()))
+        self.pending_files.clear()
+        while self.pending and not self._stopped:
+            text = self.pending.pop(0)
+            location = 0
+            for word in text.split():
+                for callback in self.callbacks.get('started-word', []):
+                    callback(None, location, len(word))
+                if self._stopped:
+                    break
+                if self.word_delay:
+                    time.sleep(self.word_delay)
+                location += len(word) + 1
+            (self.interrupted if self._stopped else self.spoken).append(text)
+        self.pending.clear()
+
+AUDIO_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "audio_cache")
+
+class AudioCache:
+    """Size-bounded directory of synthesized speech keyed by text, voice and rate.
+
+    The least recently played files are evicted first. Playing a file
+    touches its mtime, so the order survives restarts.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 64 * 1024 * 1024):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.files: "OrderedDict[str, int]" = OrderedDict()
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+        entries = [e for e in os.scandir(directory) if e.is_file() and e.name.endswith(".wav") and ".tmp" not in e.name]
+        for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+            size = entry.stat().st_size
+            self.files[entry.name[:-4]] = size
+            self.total_bytes += size
+        self._evict()
+
+    @staticmethod
+    def key(text: str, voice, rate) -> str:
+        return hashlib.sha1(f"{voice}\0{rate}\0{text}".encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.wav")
+
+    def get(self, key: str) -> Optional[str]:
+        """Path of the cached audio, or None on a miss"""
+        with self._lock:
+            if key not in self.files:
+                return None
+            self.files.move_to_end(key)
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            # Removed behind our back
+            with self._lock:
+                self.total_bytes -= self.files.pop(key, 0)
+            return None
+        return path
+
+    def synthesize(self, engine, text: str, key: str) -> Optional[str]:
+        """Render text to the cache with the engine's save_to_file"""
+        temporary = os.path.join(self.directory, f"{key}.tmp.wav")
+        engine.save_to_file(text, temporary)
+        engine.runAndWait()
+        try:
+            size = os.path.getsize(temporary)
+        except OSError:
+            return None
+        if not size:
+            os.remove(temporary)
+            return None
+        path = self.path(key)
+        os.replace(temporary, path)
+        with self._lock:
+            self.total_bytes += size - self.files.pop(key, 0)
+            self.files[key] = size
+            self._evict()
+        return path
+
+    def discard(self, key: str):
+        with self._lock:
+            self.total_bytes -= self.files.pop(key, 0)
+        try:
+            os.remove(self.path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self.files) > 1:
+            key, size = self.files.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+class WavPlayer:
+    """Plays audio files through the platform's own player; stop() cuts playback short"""
+
+    COMMANDS = (["afplay"], ["aplay", "-q"], ["paplay"], ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"])
+
+    def __init__(self):
+        self.command = None
+        self._process: Optional[subprocess.Popen] = None
+        self._stopped = threading.Event()
+        if sys.platform != "win32":
+            self.command = next((c for c in self.COMMANDS if shutil.which(c[0])), None)
+
+    @property
+    def available(self) -> bool:
+        return sys.platform == "win32" or self.command is not None
+
+    def play(self, path: str):
+        """Play a file to the end or until stop() is called"""
+        self._stopped.clear()
+        if sys.platform == "win32":
+            import winsound
+            with wave.open(path, "rb") as wav:
+                duration = wav.getnframes() / wav.getframerate()
+            winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+            if self._stopped.wait(duration):
+                winsound.PlaySound(None, 0)
+            return
+        self._process = subprocess.Popen(self.command + [path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self._process.wait()
+
+    def stop(self):
+        self._stopped.set()
+        process = self._process
+        if process is not None and process.poll() is None:
+            process.terminate()
+
+class SpeechWorker:
+    """Single long-lived thread that owns the TTS engine.
+
+    Utterances go through a bounded queue. A priority utterance bumps the
+    generation counter, which drops everything queued before it and stops
+    the utterance currently being spoken at its next word.
+
+    With an AudioCache, utterances queued with cache=True are played from
+    disk when their audio exists. Misses are spoken live and synthesized
+    into the cache while the worker is idle.
+    """
+
+    # Seconds without queued speech before the worker fills the audio cache
+    FILL_IDLE = 0.5
+
+    def __init__(self, engine_factory: Callable, maxsize: int = 16,
+                 on_state: Optional[Callable[[AssistantState], None]] = None,
+                 audio_cache: Optional[AudioCache] = None, player: Optional[WavPlayer] = None):
+        self.engine_factory = engine_factory
+        self.on_state = on_state
+        self.audio_cache = audio_cache
+        self.player = player or (WavPlayer() if audio_cache is not None else None)
+        if self.audio_cache is not None and not self.player.available:
+            logging.warning("No audio player found; speaking cached prompts live")
+            self.audio_cache = None
+        self._to_fill: "OrderedDict[str, str]" = OrderedDict()
+        self._voice_key: Tuple = (None, None)
+        self._speaking = False
+        self.queue: "queue.Queue[Optional[Tuple[int, str, bool]]]" = queue.Queue(maxsize=maxsize)
+        self.engine = None
+        self._generation = 0
+        self._current_generation = 0
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._init_error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+
+    def start(self, wait: bool = False, timeout: float = 10.0):
+        """Start the worker; the engine initializes on the worker thread.
+
+        Utterances queued before the engine is ready are spoken once it is.
+        With wait=True, block until initialization finished and raise its error.
+        """
+        self._thread.start()
+        if not wait:
+            return
+        if not self._ready.wait(timeout):
+            raise TimeoutError("TTS engine did not initialize in time")
+        if self._init_error is not None:
+            raise self._init_error
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def say(self, text: str, priority: bool = False, cache: bool = False):
+        """Queue an utterance without blocking the caller.
+
+        cache=True marks fixed text whose audio may be reused.
+        """
+        with self._lock:
+            if priority:
+                self._interrupt()
+            item = (self._generation, text, cache)
+            try:
+                self.queue.put_nowait(item)
+            except queue.Full:
+                # Drop the oldest pending utterance rather than block the conversation
+                try:
+                    dropped = self.queue.get_nowait()
+                    logging.warning(f"Speech queue full, dropping: {dropped[1] if dropped else dropped}")
+                except queue.Empty:
+                    pass
+                self.queue.put_nowait(item)
+
+    @property
+    def busy(self) -> bool:
+        """Speaking, or speech is queued"""
+        return self._speaking or not self.queue.empty()
+
+    def interrupt(self):
+        """Stop the current utterance and drop everything queued (barge-in)"""
+        with self._lock:
+            self._interrupt()
+
+    def _interrupt(self):
+        self._generation += 1
+        self._drain()
+        if self.player is not None:
+            self.player.stop()
+
+    def prefill(self, texts: Iterable[str]):
+        """Synthesize audio for texts that are not cached yet, while idle"""
+        if self.audio_cache is None:
+            return
+        with self._lock:
+            for text in texts:
+                self._to_fill[text] = None
+
+    def shutdown(self, finish_pending: bool = False, timeout: float = 10.0):
+        """Stop the worker; optionally let queued speech finish first"""
+        with self._lock:
+            if not finish_pending:
+                self._generation += 1
+                self._drain()
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            logging.warning("Speech queue still full at shutdown")
+        self._thread.join(timeout)
+
+    def _drain(self):
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def _set_state(self, state: AssistantState):
+        if self.on_state:
+            self.on_state(state)
+
+    def _on_word(self, name, location, length):
+        if self._current_generation != self._generation:
+            self.engine.stop()
+
+    def _run(self):
+        start = time.perf_counter()
+        try:
+            self.engine = self.engine_factory()
+            self.engine.connect('started-word', self._on_word)
+            logging.info(f"TTS initialized in {(time.perf_counter() - start) * 1000:.0f} ms")
+        except Exception as e:
+            # Keep consuming the queue so the conversation continues as text
+            logging.error(f"TTS initialization error, continuing without speech: {e}")
+            self._init_error = e
+            self.engine = None
+        if self.engine is None:
+            self.audio_cache = None
+        elif self.audio_cache is not None:
+            self._voice_key = (self.engine.getProperty('voice'), self.engine.getProperty('rate'))
+        self._ready.set()
+
+        while True:
+            try:
+                item = self.queue.get(timeout=self.FILL_IDLE if self._to_fill else None)
+            except queue.Empty:
+                self._fill_one()
+                continue
+            if item is None:
+                break
+            generation, text, cache = item
+            if generation != self._generation:
+                continue
+            self._current_generation = generation
+            self._speaking = True
+            try:
+                self._set_state(AssistantState.SPEAKING)
+                print(f"🤖 Assistant: {text}")
+                if self.engine is not None:
+                    with METRICS.span("tts"):
+                        self._speak(text, cache and self.audio_cache is not None)
+            except Exception as e:
+                logging.error(f"Speech error: {e}")
+            finally:
+                self._speaking = False
+                self._set_state(AssistantState.IDLE)
+
+    def _speak(self, text: str, cache: bool):
+        if cache:
+            path = self.audio_cache.get(AudioCache.key(text, *self._voice_key))
+            if path is not None:
+                METRICS.inc("audio_cache_total", result="hit")
+                self.player.play(path)
+                return
+            METRICS.inc("audio_cache_total", result="miss")
+            with self._lock:
+                self._to_fill[text] = None
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+    def _fill_one(self):
+        with self._lock:
+            text, _ = self._to_fill.popitem(last=False)
+            generation = self._current_generation = self._generation
+        key = AudioCache.key(text, *self._voice_key)
+        if self.audio_cache.get(key) is not None:
+            return
+        try:
+            with METRICS.span("tts_cache_fill"):
+                self.audio_cache.synthesize(self.engine, text, key)
+        except Exception as e:
+            logging.error(f"Audio cache synthesis failed: {e}")
+        if generation != self._generation:
+            # Interrupted by priority speech; the file may be truncated
+            self.audio_cache.discard(key)
+
+@dataclass
+class RecognitionResult:
+    text: str
+    confidence: float
+    backend: str
+    language: Optional[str] = None
+    latency: float = 0.0
+
+class RecognizerBackend:
+    """Speech-to-text engine used by RecognizerChain.
+
+    recognize() returns (text, confidence) or None when nothing was
+    understood, and raises sr.RequestError when the engine is unavailable.
+    Backends with multilingual = False ignore the language argument and
+    are only called once per utterance.
+    """
+
+    name = "backend"
+    multilingual = True
+
+    def recognize(self, audio, language: Optional[str]) -> Optional[Tuple[str, float]]:
+        raise NotImplementedError
+
+class GoogleRecognizerBackend(RecognizerBackend):
+    """Google Web Speech API via speech_recognition (network)"""
+
+    name = "google"
+
+    def __init__(self, operation_timeout: float = 5):
+        self.operation_timeout = operation_timeout
+        self.recognizer = None
+
+    def recognize(self, audio, language: Optional[str]) -> Optional[Tuple[str, float]]:
+        if self.recognizer is None:
+            self.recognizer = sr.Recognizer()
+            self.recognizer.operation_timeout = self.operation_timeout
+        try:
+            result = self.recognizer.recognize_google(audio, language=language or "en-US", show_all=True)
+        except sr.UnknownValueError:
+            return None
+        if not result or not result.get("alternative"):
+            return None
+        best = result["alternative"][0]
+        # Google only reports confidence for some results
+        return best["transcript"], best.get("confidence", 0.8)
+
+class VoskRecognizerBackend(RecognizerBackend):
+    """Offline recognition with a local Vosk model (pip install vosk)"""
+
+    name = "vosk"
+    multilingual = False
+    sample_rate = 16000
+
+    def __init__(self, model_path: str):
+        try:
+            import vosk  #type:ignore
+        except ImportError as e:
+            raise RuntimeError("vosk is not installed; pip install vosk") from e
+        vosk.SetLogLevel(-1)
+        self.vosk = vosk
+        self.model = vosk.Model(model_path)
+
+    def recognize(self, audio, language: Optional[str]) -> Optional[Tuple[str, float]]:
+        recognizer = self.vosk.KaldiRecognizer(self.model, self.sample_rate)
+        recognizer.SetWords(True)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        result = json.loads(recognizer.FinalResult())
+        text = result.get("text", "").strip()
+        if not text:
+            return None
+        words = result.get("result") or []
+        confidence = sum(w.get("conf", 0.0) for w in words) / len(words) if words else 0.0
+        return text, confidence
+
+class ScriptedRecognizerBackend(RecognizerBackend):
+    """Returns prepared transcripts in order, ignoring the audio.
+
+    Used to run the voice loop headless; an empty line stands for an
+    utterance that was not understood.
+    """
+
+    name = "scripted"
+    multilingual = False
+
+    def __init__(self, transcripts: List[str], confidence: float = 1.0):
+        self.transcripts = list(transcripts)
+        self.confidence = confidence
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str) -> "ScriptedRecognizerBackend":
+        with open(path, encoding="utf-8") as f:
+            return cls([line.rstrip("\n") for line in f])
+
+    def recognize(self, audio, language: Optional[str]) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            if not self.transcripts:
+                return None
+            text = self.transcripts.pop(0).strip()
+        return (text, self.confidence) if text else None
+
+class RecognizerChain:
+    """Tries recognition backends in order within a time budget.
+
+    Each backend runs all language variants concurrently and the first
+    result above min_confidence wins; otherwise the best low-confidence
+    result is kept and the next backend is tried. Per-backend latency is
+    recorded so deployments can order backends by speed.
+    """
+
+    def __init__(self, backends: List[RecognizerBackend], languages: Tuple[str, ...] = ("en-IN", "en-US"),
+                 min_confidence: float = 0.6, timeout: float = 6.0):
+        self.backends = backends
+        self.languages = languages
+        self.min_confidence = min_confidence
+        self.timeout = timeout
+        self.latencies: Dict[str, List[float]] = {backend.name: [] for backend in backends}
+        self.failures: Dict[str, int] = {backend.name: 0 for backend in backends}
+        self._lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max(2, len(languages)), thread_name_prefix="stt")
+
+    def _timed(self, backend: RecognizerBackend, audio, language: Optional[str]) -> Optional[RecognitionResult]:
+        start = time.perf_counter()
+        try:
+            result = backend.recognize(audio, language)
+        except Exception:
+            with self._lock:
+                self.failures[backend.name] += 1
+            raise
+        latency = time.perf_counter() - start
+        with self._lock:
+            self.latencies[backend.name].append(latency)
+        if result is None:
+            return None
+        return RecognitionResult(result[0], result[1], backend.name, language, latency)
+
+    def recognize(self, audio) -> Optional[RecognitionResult]:
+        """Best transcript for the audio, or None if nothing was understood.
+
+        Raises sr.RequestError only when every backend failed with an error.
+        """
+        with METRICS.span("recognition"):
+            result = self._recognize(audio)
+        METRICS.inc("recognition_total", outcome="recognized" if result else "not_understood")
+        return result
+
+    def _recognize(self, audio) -> Optional[RecognitionResult]:
+        deadline = time.monotonic() + self.timeout
+        best: Optional[RecognitionResult] = None
+        errors = []
+        responded = False
+
+        for backend in self.backends:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logging.warning("Recognition time budget exhausted")
+                break
+            languages = self.languages if backend.multilingual else (None,)
+            futures = [self.executor.submit(self._timed, backend, audio, language) for language in languages]
+            try:
+                for future in as_completed(futures, timeout=remaining):
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logging.error(f"{backend.name} recognition error: {e}")
+                        METRICS.inc("recognition_backend_errors_total", backend=backend.name)
+                        errors.append(e)
+                        continue
+                    responded = True
+                    if result is None:
+                        continue
+                    if result.confidence >= self.min_confidence:
+                        return result
+                    if best is None or result.confidence > best.confidence:
+                        best = result
+            except FutureTimeoutError:
+                logging.warning(f"{backend.name} recognition timed out")
+
+        if not responded and errors:
+            raise sr.RequestError(f"All recognition backends failed: {errors[-1]}")
+        return best
+
+    def latency_summary(self) -> Dict[str, Dict[str, float]]:
+        """Successful calls, failures and mean/max latency in milliseconds per backend"""
+        with self._lock:
+            return {
+                name: {
+                    "calls": len(samples),
+                    "failures": self.failures[name],
+                    "mean_ms": round(sum(samples) / len(samples) * 1000, 1) if samples else 0.0,
+                    "max_ms": round(max(samples) * 1000, 1) if samples else 0.0
+                }
+                for name, samples in self.latencies.items()
+            }
+
+    def fastest_backend(self) -> Optional[str]:
+        """Name of the backend with the lowest mean latency so far"""
+        summary = {name: stats for name, stats in self.latency_summary().items() if stats["calls"]}
+        return min(summary, key=lambda name: summary[name]["mean_ms"]) if summary else None
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+def build_recognizer_chain(vosk_model: Optional[str] = None) -> RecognizerChain:
+    """Offline Vosk first when a model is configured, then Google"""
+    backends: List[RecognizerBackend] = []
+    vosk_model = vosk_model or os.environ.get("INONETECX_VOSK_MODEL")
+    if vosk_model:
+        try:
+            backends.append(VoskRecognizerBackend(vosk_model))
+        except Exception as e:
+            logging.error(f"Offline recognizer unavailable: {e}")
+    backends.append(GoogleRecognizerBackend())
+    return RecognizerChain(backends)
+
+class AudioRingBuffer:
+    """Fixed-capacity FIFO of audio frames shared by a producer and a consumer.
+
+    When the consumer falls behind, the oldest frames are dropped so memory
+    stays bounded.
+    """
+
+    def __init__(self, capacity: int):
+        self.frames: deque = deque(maxlen=capacity)
+        self.dropped = 0
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def write(self, frame: bytes):
+        with self._cond:
+            if len(self.frames) == self.frames.maxlen:
+                self.dropped += 1
+            self.frames.append(frame)
+            self._cond.notify()
+
+    def read(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Next frame, or None on timeout or once closed and empty"""
+        with self._cond:
+            if not self.frames and not self.closed:
+                self._cond.wait(timeout)
+            return self.frames.popleft() if self.frames else None
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+def frame_rms(frame: bytes) -> float:
+    """Root-mean-square energy of a 16-bit little-endian mono frame"""
+    samples = array("h", frame)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(x * x for x in samples) / len(samples))
+
+class VoiceActivitySegmenter:
+    """Energy-based VAD that turns a frame stream into utterance segments.
+
+    A segment starts after start_frames consecutive loud frames (with a
+    short pre-roll so the onset isn't clipped) and ends after silence_ms of
+    quiet or at max_seconds.
+    """
+
+    def __init__(self, frame_ms: int = 30, energy_threshold: float = 300, start_frames: int = 3,
+                 silence_ms: int = 800, preroll_ms: int = 300, max_seconds: float = 10):
+        self.energy_threshold = energy_threshold
+        self.start_frames = start_frames
+        self.silence_frames = max(1, silence_ms // frame_ms)
+        self.max_frames = int(max_seconds * 1000 // frame_ms)
+        self.preroll: deque = deque(maxlen=max(start_frames, preroll_ms // frame_ms))
+        self.segment: List[bytes] = []
+        self.in_speech = False
+        self.loud_run = 0
+        self.quiet_run = 0
+
+    def push(self, frame: bytes) -> Optional[bytes]:
+        """Feed one frame; returns the raw audio of a finished segment"""
+        loud = frame_rms(frame) >= self.energy_threshold
+        if not self.in_speech:
+            self.preroll.append(frame)
+            self.loud_run = self.loud_run + 1 if loud else 0
+            if self.loud_run >= self.start_frames:
+                self.in_speech = True
+                self.segment = list(self.preroll)
+                self.preroll.clear()
+                self.quiet_run = 0
+            return None
+
+        self.segment.append(frame)
+        self.quiet_run = 0 if loud else self.quiet_run + 1
+        if self.quiet_run >= self.silence_frames or len(self.segment) >= self.max_frames:
+            return self.flush()
+        return None
+
+    def flush(self) -> Optional[bytes]:
+        """End the current segment (e.g. at end of input)"""
+        if not self.in_speech:
+            return None
+        segment = b"".join(self.segment)
+        self.segment = []
+        self.in_speech = False
+        self.loud_run = 0
+        return segment
+
+def wake_word_pattern(wake_words: Iterable[str]) -> "re.Pattern":
+    """Regex for a transcript that starts with a wake word.
+
+    The wake word must be whole words and may follow punctuation
+    ("Computer, what are your prices?"); group 1 is the rest of the
+    utterance. "I need a computer vision system" does not match.
+    """
+    words = sorted((re.escape(w.lower()).replace(r"\ ", r"\s+") for w in wake_words), key=len, reverse=True)
+    return re.compile(rf"^\W*(?:{'|'.join(words)})\b\W*(.*)$", re.DOTALL)
+
+class WakeWordDetector:
+    """Decides whether a short speech segment starts with a wake word"""
+
+    # Whether detect_command() returns the words spoken after the wake word
+    transcribes = False
+
+    def __init__(self, wake_words: List[str]):
+        self.wake_words = [w.lower() for w in wake_words]
+        self.pattern = wake_word_pattern(self.wake_words)
+
+    def detect(self, audio) -> bool:
+        return self.detect_command(audio) is not None
+
+    def detect_command(self, audio) -> Optional[RecognitionResult]:
+        """None without a leading wake word, else what follows it.
+
+        The text is "" when nothing follows. Detectors that don't
+        transcribe return some non-empty text when more speech follows.
+        """
+        raise NotImplementedError
+
+class VoskWakeWordDetector(WakeWordDetector):
+    """Local keyword spotting: Vosk decoding restricted to the wake words"""
+
+    def __init__(self, wake_words: List[str], model_path: str, sample_rate: int = 16000):
+        super().__init__(wake_words)
+        try:
+            import vosk  #type:ignore
+        except ImportError as e:
+            raise RuntimeError("vosk is not installed; pip install vosk") from e
+        vosk.SetLogLevel(-1)
+        self.vosk = vosk
+        self.model = vosk.Model(model_path)
+        self.sample_rate = sample_rate
+        self.grammar = json.dumps(self.wake_words + ["[unk]"])
+
+    def detect_command(self, audio) -> Optional[RecognitionResult]:
+        recognizer = self.vosk.KaldiRecognizer(self.model, self.sample_rate, self.grammar)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        match = self.pattern.match(json.loads(recognizer.FinalResult()).get("text", ""))
+        # Anything after the wake word decodes as "[unk]"
+        return RecognitionResult(match.group(1).strip(), 1.0, "vosk-wake-word") if match else None
+
+class TranscriptWakeWordDetector(WakeWordDetector):
+    """Wake word check using any RecognizerBackend's transcript"""
+
+    transcribes = True
+
+    def __init__(self, wake_words: List[str], backend: RecognizerBackend, language: Optional[str] = "en-US"):
+        super().__init__(wake_words)
+        self.backend = backend
+        self.language = language
+
+    def detect_command(self, audio) -> Optional[RecognitionResult]:
+        start = time.perf_counter()
+        try:
+            result = self.backend.recognize(audio, self.language)
+        except sr.RequestError as e:
+            logging.error(f"Wake word recognition error: {e}")
+            return None
+        match = self.pattern.match(result[0].lower()) if result else None
+        if match is None:
+            return None
+        return RecognitionResult(match.group(1).strip(" ,.!?"), result[1], self.backend.name, self.language,
+                                 time.perf_counter() - start)
+
+class ContinuousListener:
+    """Always-on capture gated by local VAD and wake-word detection.
+
+    A background thread keeps one microphone stream open and writes
+    fixed-size frames into a ring buffer (feed_wav() does the same from a
+    file). next_command() segments the frames with the VAD, checks
+    segments for a wake word, and only sends the segment after a wake
+    word to the recognizer chain. A segment that goes on past its wake
+    word is itself the command.
+    """
+
+    def __init__(self, recognizer_chain: RecognizerChain, wake_detector: WakeWordDetector,
+                 sample_rate: int = 16000, frame_ms: int = 30, buffer_seconds: float = 30,
+                 energy_threshold: float = 300, command_window: float = 8.0):
+        self.recognizer_chain = recognizer_chain
+        self.wake_detector = wake_detector
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_bytes = sample_rate * frame_ms // 1000 * 2
+        self.frames = AudioRingBuffer(int(buffer_seconds * 1000 // frame_ms))
+        self.segmenter = VoiceActivitySegmenter(frame_ms=frame_ms, energy_threshold=energy_threshold)
+        self.command_window = command_window
+        self.wake_detections = 0
+        self.recognition_calls = 0
+        # Called from the listening thread on every wake word (barge-in)
+        self.on_wake: Optional[Callable[[], None]] = None
+        self._armed_until = 0.0
+        self._stop = threading.Event()
+        self._capture: Optional[threading.Thread] = None
+
+    def start_microphone(self):
+        """Open the microphone once and stream frames in the background.
+
+        Calibration also happens on the capture thread, so this returns
+        immediately.
+        """
+        if self._capture is not None:
+            return
+
+        def capture():
+            try:
+                with sr.Microphone(sample_rate=self.sample_rate, chunk_size=self.frame_bytes // 2) as source:
+                    print("🎤 Calibrating microphone...")
+                    calibration = sr.Recognizer()
+                    calibration.adjust_for_ambient_noise(source, duration=1)
+                    self.segmenter.energy_threshold = max(calibration.energy_threshold, 100)
+                    print("🎤 Audio systems calibrated")
+                    while not self._stop.is_set():
+                        self.frames.write(source.stream.read(source.CHUNK))
+            except Exception as e:
+                logging.error(f"Microphone capture stopped: {e}")
+            finally:
+                self.frames.close()
+
+        self._capture = threading.Thread(target=capture, name="mic-capture", daemon=True)
+        self._capture.start()
+
+    def feed_wav(self, path: str, close: bool = True):
+        """Push a 16-bit mono WAV file into the ring buffer as frames"""
+        with wave.open(path, "rb") as wav:
+            if wav.getnchannels() != 1:
+                raise ValueError(f"{path}: expected mono audio")
+            raw = wav.readframes(wav.getnframes())
+            if wav.getframerate() != self.sample_rate or wav.getsampwidth() != 2:
+                raw = sr.AudioData(raw, wav.getframerate(), wav.getsampwidth()).get_raw_data(
+                    convert_rate=self.sample_rate, convert_width=2)
+        for start in range(0, len(raw) - self.frame_bytes + 1, self.frame_bytes):
+            self.frames.write(raw[start:start + self.frame_bytes])
+        if close:
+            self.frames.close()
+
+    def _audio(self, segment: bytes):
+        return sr.AudioData(segment, self.sample_rate, 2)
+
+    def _handle_segment(self, segment: bytes) -> Optional[RecognitionResult]:
+        audio = self._audio(segment)
+        if time.monotonic() < self._armed_until:
+            self._armed_until = 0.0
+            self.recognition_calls += 1
+            return self.recognizer_chain.recognize(audio)
+        wake = self.wake_detector.detect_command(audio)
+        if wake is None:
+            return None
+        self.wake_detections += 1
+        print("👂 Wake word detected")
+        if self.on_wake:
+            self.on_wake()
+        # A command in the same breath ("computer, what are your prices")
+        command = self._command_after_wake_word(audio, wake) if wake.text else None
+        if command is None:
+            self._armed_until = time.monotonic() + self.command_window
+        return command
+
+    def _command_after_wake_word(self, audio, wake: RecognitionResult) -> Optional[RecognitionResult]:
+        if self.wake_detector.transcribes:
+            return wake
+        self.recognition_calls += 1
+        result = self.recognizer_chain.recognize(audio)
+        if result is None:
+            return None
+        match = self.wake_detector.pattern.match(result.text.lower())
+        text = match.group(1).strip(" ,.!?") if match else result.text
+        return dataclasses.replace(result, text=text) if text else None
+
+    def next_command(self, timeout: Optional[float] = None) -> Optional[RecognitionResult]:
+        """Block until a command follows a wake word; None on timeout or end of input"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._stop.is_set():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            frame = self.frames.read(timeout=0.5 if remaining is None else min(0.5, remaining))
+            if frame is None:
+                if self.frames.closed:
+                    segment = self.segmenter.flush()
+                    return self._handle_segment(segment) if segment else None
+                continue
+            segment = self.segmenter.push(frame)
+            if segment:
+                result = self._handle_segment(segment)
+                if result:
+                    return result
+        return None
+
+    def stop(self):
+        self._stop.set()
+        self.frames.close()
+        if self._capture is not None:
+            self._capture.join(2)
+
+def build_wake_word_detector(wake_words: List[str], vosk_model: Optional[str] = None,
+                             cloud_fallback: bool = False) -> WakeWordDetector:
+    """Local Vosk keyword spotting when a model is configured.
+
+    Without one, wake words are only checked with Google recognition if
+    cloud_fallback is set, since that sends every speech segment to the
+    cloud; otherwise this raises RuntimeError.
+    """
+    vosk_model = vosk_model or os.environ.get("INONETECX_VOSK_MODEL")
+    if vosk_model:
+        try:
+            return VoskWakeWordDetector(wake_words, vosk_model)
+        except Exception as e:
+            if not cloud_fallback:
+                raise RuntimeError(f"Local wake word detector unavailable: {e}") from e
+            logging.error(f"Local wake word detector unavailable: {e}")
+    elif not cloud_fallback:
+        raise RuntimeError("continuous listening needs a Vosk model (--vosk-model) for local wake words, "
+                           "or --cloud-wake-word")
+    logging.warning("Checking wake words with Google recognition: every speech segment is sent to the cloud")
+    return TranscriptWakeWordDetector(wake_words, GoogleRecognizerBackend())
+
+class InonetecxChatSession:
+    """Text-only conversation state: one instance per chat user.
+
+    The knowledge base store is shared read-only between sessions; only the
+    conversation history and context belong to the session.
+    """
+
+    # Only a local voice assistant should open a browser window
+    opens_browser = False
+
+    def __init__(self, store: Optional["KnowledgeBaseStore"] = None, response_cache: Optional["ResponseCache"] = None,
+                 history_size: int = 50):
+        self.conversation_history = ConversationHistory(history_size)
+        self.response_cache = response_cache if response_cache is not None else RESPONSE_CACHE
+        self.context = ConversationContext(
+            session_start=datetime.datetime.now(),
+            follow_up_questions=[],
+            user_preferences={}
+        )
+        self.last_active = time.monotonic()
+        self.lock = threading.Lock()
+        # Saves of this session to a SessionStore so far
+        self.state_version = 0
+        # history.total_turns as of the last load from or save to the store
+        self.synced_turns = 0
+        if store is None:
+            self.load_knowledge_base()
+        else:
+            self.store = store
+
+    def load_knowledge_base(self):
+        """Use the shared knowledge base loaded from knowledge_base.json"""
+        self.store = default_knowledge_base_store()
+
+    @property
+    def knowledge_base(self) -> Dict:
+        return self.store.current.data
+
+    def extract_intents(self, command: str) -> List[Tuple[str, Dict]]:
+        """Every (intent, entities) pair asked about in one message, in order"""
+        start = time.perf_counter()
+        intents = INTENT_CLASSIFIER.match_all(command)
+        # Hot path: plain timing instead of a span context manager
+        METRICS.observe("intent", time.perf_counter() - start)
+        for intent, _ in intents:
+            METRICS.inc("intent_total", intent=intent)
+        if intents[0][0] == "unknown":
+            METRICS.inc("unknown_fallback_total")
+        if len(intents) > 1:
+            METRICS.inc("multi_intent_total")
+        return intents
+
+    def extract_intent_and_entities(self, command: str) -> Tuple[str, Dict]:
+        """Advanced intent recognition and entity extraction; the first
+        pair of a compound question"""
+        return self.extract_intents(command)[0]
+
+    def compose_response(self, intents: List[Tuple[str, Dict]], command: str) -> str:
+        """One answer covering every intent of a compound question.
+
+        Only the last part keeps its closing question, so the merged answer
+        ends with a single follow-up.
+        """
+        if len(intents) == 1:
+            return self.generate_contextual_response(*intents[0], command)
+        responses = []
+        for intent, entities in intents:
+            if intent == "unknown":
+                # A clause nothing matched: answer it from the knowledge base or leave it out
+                response = self._retrieval_answer(self.store.current, entities.get("question", command))
+                if response is not None:
+                    responses.append(response)
+                continue
+            responses.append(self.generate_contextual_response(intent, entities, command))
+        parts = []
+        for position, response in enumerate(responses, 1):
+            if position < len(responses):
+                sentences = list(split_sentences(response))
+                while len(sentences) > 1 and sentences[-1].endswith("?"):
+                    sentences.pop()
+                response = " ".join(sentences)
+            parts.append(response)
+        return " ".join(parts)
+
+    def generate_contextual_response(self, intent: str, entities: Dict, command: str) -> str:
+        """Generate intelligent, contextual responses"""
+        start = time.perf_counter()
+        response = self._cached_response(intent, entities, command)
+        METRICS.observe("response", time.perf_counter() - start)
+        return response
+
+    def _cached_response(self, intent: str, entities: Dict, command: str) -> str:
+        self.context.last_topic = intent
+        # Read the snapshot once so a concurrent reload can't mix versions
+        kb = self.store.current
+        if intent in UNCACHED_INTENTS:
+            return self._render_response(kb, intent, entities, command, None)
+
+        bucket = time_bucket() if intent == "greeting" else None
+        key = (intent, entities.get("service"), bucket)
+        response = self.response_cache.get(kb, key)
+        if response is None:
+            response = self._render_response(kb, intent, entities, command, bucket)
+            self.response_cache.put(kb, key, response)
+        return response
+
+    def _render_response(self, kb: "KnowledgeBase", intent: str, entities: Dict, command: str, bucket: Optional[str]) -> str:
+        """Build the response text for an intent from a knowledge base snapshot"""
+        if intent == "greeting":
+            greeting = f"Good {bucket or time_bucket()}!"
+            return f"{greeting} Welcome to Inonetecx. I'm your AI assistant. How can I help you transform your business with technology today?"
+
+        elif intent == "about_company":
+            company = kb.data["company_info"]
+            return f"{company['about']} {company['tagline']}. We're founded in {company['foundation']} with a mission: {company['mission']}. Would you like to know about our specific services?"
+
+        elif intent == "services":
+            service = kb.services_by_entity.get(entities.get("service"))
+            if service:
+                return f"{service['description']}. We use technologies like {', '.join(service['technologies'])}. Typical timeline is {service['timeline']}. Would you like to know about pricing?"
+
+            return f"We offer comprehensive technology solutions: {kb.service_names_text}. Which service interests you most? I can provide detailed information about any of them."
+
+        elif intent == "pricing":
+            if "service" in entities:
+                service = entities["service"]
+                if service == "web":
+                    price = kb.pricing_by_entity["web"]
+                    return f"Our web development {price['description']} {price['currency']}{price['start']:,}. This includes responsive design, basic SEO, and 3 months free support. Shall I connect you with our team for a detailed quote?"
+                elif service == "mobile":
+                    price = kb.pricing_by_entity["mobile"]
+                    return f"Our mobile app development {price['description']} {price['currency']}{price['start']:,}. This covers both Android and iOS with basic features. Complex apps may cost more. Would you like a free consultation?"
+                # Add more service-specific pricing...
+                    
+            pricing = kb.data["pricing"]
+            return f"Here's our starting pricing: Web Development from ₹{pricing['web_development']['start']:,}, Mobile Apps from ₹{pricing['mobile_development']['start']:,}, Cloud Solutions from ₹{pricing['cloud_solutions']['start']:,}. All projects include free consultation and post-launch support. Which service interests you?"
+
+        elif intent == "contact":
+            contact = kb.data["contact"]
+            return f"You can reach us at: 📧 Email: {contact['email']}, 📞 Phone: {contact['phone']}, 📍 Address: {contact['address']}. Our business hours are {contact['business_hours']}. Would you like me to open our website for more information?"
+
+        elif intent == "team":
+            team = kb.data["team"]
+            return f"We have {team['size']} with expertise in {', '.join(team['expertise'])}. Our team has {team['experience']} and holds certifications like {', '.join(team['certifications'])}. We follow agile methodologies and maintain high code quality standards."
+
+        elif intent == "process":
+            process = kb.data["process"]
+            steps = [f"{i+1}. {step.capitalize()}: {desc}" for i, (step, desc) in enumerate(process.items())]
+            return f"Our development process follows these steps: {' → '.join([f'{i+1}. {step.capitalize()}' for i, step in enumerate(process.keys())])}. We ensure transparency and regular communication throughout. Would you like details about any specific phase?"
+
+        elif intent == "timeline":
+            service = kb.services_by_entity.get(entities.get("service"))
+            if service:
+                timeline = service["timeline"]
+                return f"For {entities['service']} projects, typical timeline is {timeline}. However, exact timeline depends on your specific requirements. Shall I schedule a free consultation to give you a precise estimate?"
+
+            return "Project timelines vary by complexity: Web Development (2-8 weeks), Mobile Apps (6-16 weeks), Cloud Solutions (4-12 weeks), AI/ML Projects (8-20 weeks). We always provide detailed timelines after understanding your requirements."
+
+        elif intent == "technology":
+            service = kb.services_by_entity.get(entities.get("service"))
+            if service:
+                return f"For {service['name']} we work with {', '.join(service['technologies'])}. Would you like to know about timelines or pricing?"
+
+            stacks = "; ".join(f"{s['name']}: {', '.join(s['technologies'])}" for s in kb.services_by_entity.values())
+            return f"Our technology stack by service: {stacks}. Which one would you like to know more about?"
+
+        elif intent == "portfolio":
+            company = kb.data["company_info"]
+            return f"We've delivered projects in {kb.service_names_text} and have {company['clients']}. Would you like me to open our website to see our portfolio and case studies?"
+
+        elif intent == "website":
+            if self.opens_browser:
+                try:
+                    webbrowser.open(kb.data["contact"]["website"], new=2)
+                    return f"Opening our website {kb.data['contact']['website']} in your browser. You can explore our portfolio, read client testimonials, and get in touch directly through the contact form."
+                except Exception as e:
+                    logging.error(f"Browser error: {e}")
+            return f"Please visit our website: {kb.data['contact']['website']} to see our portfolio and get detailed information about our services."
+
+        elif intent == "goodbye":
+            session_duration = datetime.datetime.now() - self.context.session_start
+            return f"Thank you for spending {session_duration.seconds//60} minutes with me! It was great helping you learn about Inonetecx. Feel free to contact us anytime for your technology needs. Have a wonderful day! 🚀"
+
+        else:
+            # Look for the answer among the knowledge base passages first;
+            # only for unknown intents, whose responses are never cached
+            answer = self._retrieval_answer(kb, entities.get("question", command)) if intent == "unknown" else None
+            if answer:
+                return answer
+
+            # Intelligent fallback with suggestions
+            suggestions = [
+                "our services and pricing",
+                "our development process",
+                "our team and expertise",
+                "contact information",
+                "project timelines"
+            ]
+            return f"I'd love to help you with that! I specialize in information about {', '.join(suggestions)}. You can also ask me to 'open our website' or say 'goodbye' when you're done. What would you like to know more about?"
+
+    def _retrieval_answer(self, kb: "KnowledgeBase", question: str) -> Optional[str]:
+        """The best knowledge base passage phrased as an answer, if similar enough"""
+        passage = self._retrieve(kb, question)
+        if passage is None:
+            return None
+        title, text = passage
+        return f"Here's what I found about {title}: {text.rstrip('.')}. Is there anything else you'd like to know?"
+
+    def _retrieve(self, kb: "KnowledgeBase", command: str) -> Optional[Tuple[str, str]]:
+        """Best knowledge base passage for an unknown-intent question, if similar enough"""
+        start = time.perf_counter()
+        hits = kb.retrieve(command, k=1)
+        elapsed = time.perf_counter() - start
+        METRICS.observe("retrieval", elapsed)
+        if elapsed > RETRIEVAL_BUDGET:
+            METRICS.inc("retrieval_over_budget_total")
+            logging.warning(f"Retrieval took {elapsed * 1000:.1f} ms over {len(kb.passages)} passages")
+        if hits and hits[0][0] >= RETRIEVAL_MIN_SCORE:
+            METRICS.inc("retrieval_total", outcome="answered")
+            return hits[0][1], hits[0][2]
+        METRICS.inc("retrieval_total", outcome="no_match")
+        return None
+
+    def record_turn(self, role: str, text: str, intent: Optional[str] = None, entities: Optional[Dict] = None):
+        """Add a turn to the bounded history, summarizing whatever it evicts"""
+        evicted = self.conversation_history.add(role, text, intent, (entities or {}).get("service"))
+        if evicted is not None:
+            self.context.summarize(evicted)
+
+    def respond(self, command: str) -> Tuple[str, List[Tuple[str, Dict]]]:
+        """Run the text pipeline for one user message.
+
+        Returns the response and the (intent, entities) pairs it answers;
+        the history records the first pair.
+        """
+        with self.lock:
+            self.last_active = time.monotonic()
+            intents = self.extract_intents(command)
+            self.record_turn("user", command, *intents[0])
+            response = self.compose_response(intents, command)
+            self.record_turn("assistant", response, *intents[0])
+            return response, intents
+
+    def generate_response_chunks(self, intents: List[Tuple[str, Dict]], command: str) -> Iterator[str]:
+        """Yield the contextual response one sentence at a time"""
+        yield from split_sentences(self.compose_response(intents, command))
+
+    def respond_stream(self, command: str) -> Tuple[List[Tuple[str, Dict]], Iterator[str]]:
+        """Like respond(), but the response is an iterator of sentence chunks.
+
+        The full response is added to the history once the iterator is exhausted.
+        """
+        with self.lock:
+            self.last_active = time.monotonic()
+            intents = self.extract_intents(command)
+            self.record_turn("user", command, *intents[0])
+
+        def chunks():
+            parts = []
+            for chunk in self.generate_response_chunks(intents, command):
+                parts.append(chunk)
+                yield chunk
+            with self.lock:
+                self.record_turn("assistant", " ".join(parts), *intents[0])
+
+        return intents, chunks()
+
+    # Bump when the dump_state() layout changes
+    STATE_FORMAT = 1
+
+    def dump_state(self) -> bytes:
+        """Context and history as compact bytes for a SessionStore; call with the lock held"""
+        context = self.context
+        out = StateWriter()
+        out.pack("<BdII", self.STATE_FORMAT, context.session_start.timestamp(),
+                 context.summarized_turns, self.conversation_history.total_turns)
+        out.text(context.last_topic)
+        for mapping in (context.topic_summary, context.service_summary):
+            out.pack("<H", len(mapping))
+            for key, count in mapping.items():
+                out.text(key)
+                out.pack("<I", count)
+        out.pack("<H", len(context.follow_up_questions))
+        for question in context.follow_up_questions:
+            out.text(question)
+        out.pack("<H", len(context.user_preferences))
+        for key, value in context.user_preferences.items():
+            out.text(str(key))
+            out.text(str(value))
+        out.pack("<H", len(self.conversation_history))
+        for turn in self.conversation_history:
+            out.pack("<d", turn.timestamp)
+            out.text(turn.role)
+            out.text(turn.text)
+            out.text(turn.intent)
+            out.text(turn.entity)
+        return out.getvalue()
+
+    def load_state(self, data: bytes):
+        """Replace context and history with a dump_state() snapshot"""
+        state = StateReader(data)
+        version, session_start, summarized_turns, total_turns = state.unpack("<BdII")
+        if version != self.STATE_FORMAT:
+            raise ValueError(f"unsupported session state format {version}")
+        context = ConversationContext(
+            session_start=datetime.datetime.fromtimestamp(session_start),
+            summarized_turns=summarized_turns,
+            last_topic=state.text()
+        )
+        for mapping in (context.topic_summary, context.service_summary):
+            for _ in range(state.unpack("<H")[0]):
+                key = state.text()
+                mapping[key] = state.unpack("<I")[0]
+        context.follow_up_questions = [state.text() for _ in range(state.unpack("<H")[0])]
+        context.user_preferences = {state.text(): state.text() for _ in range(state.unpack("<H")[0])}
+
+        history = ConversationHistory(self.conversation_history.capacity)
+        for _ in range(state.unpack("<H")[0]):
+            (timestamp,) = state.unpack("<d")
+            role, text, intent, entity = state.text(), state.text(), state.text(), state.text()
+            history.turns.append(ConversationTurn(role, text, intent, entity, timestamp))
+        # A smaller capacity than the writer's keeps the newest turns
+        while len(history.turns) > history.capacity:
+            context.summarize(history.turns.popleft())
+        history.total_turns = total_turns
+        self.context = context
+        self.conversation_history = history
+
+    def rebase(self, data: bytes):
+        """Load a newer dump_state() snapshot, then replay the turns added
+        here since the last sync with the store; call with the lock held.
+
+        A session cleared since that sync keeps its own state, so the clear wins.
+        """
+        unsynced = self.conversation_history.total_turns - self.synced_turns
+        if unsynced < 0:
+            return
+        turns = list(self.conversation_history)[-unsynced:] if unsynced else []
+        self.load_state(data)
+        # The replayed turns stay unsynced until the next save
+        self.synced_turns = self.conversation_history.total_turns
+        for turn in turns:
+            evicted = self.conversation_history.append(turn)
+            if evicted is not None:
+                self.context.summarize(evicted)
+            if turn.role == "user" and turn.intent:
+                self.context.last_topic = turn.intent
+
+    def clear(self):
+        """Forget the conversation so far"""
+        with self.lock:
+            self.conversation_history.clear()
+            self.context = ConversationContext(
+                session_start=datetime.datetime.now(),
+                follow_up_questions=[],
+                user_preferences={}
+            )
+
+class AdvancedInonetecxAssistant(InonetecxChatSession):
+    opens_browser = True
+
+    def __init__(self, engine_factory: Optional[Callable] = None, recognizer_chain: Optional["RecognizerChain"] = None,
+                 audio_cache: Optional[AudioCache] = None):
+        super().__init__()
+        self.state = AssistantState.IDLE
+        self.recognizer_chain = recognizer_chain or build_recognizer_chain()
+        self.recognizer = None
+        self.calibrated = threading.Event()
+        self.initialize_tts(engine_factory, audio_cache)
+        
+    def initialize_tts(self, engine_factory: Optional[Callable] = None, audio_cache: Optional[AudioCache] = None):
+        """Start the speech worker; the engine initializes in the background"""
+        try:
+            self.speech = SpeechWorker(engine_factory or create_tts_engine, on_state=self._set_state,
+                                       audio_cache=audio_cache)
+            self.speech.start()
+        except Exception as e:
+            logging.error(f"TTS initialization error: {e}")
+            sys.exit(1)
+
+    def _set_state(self, state: AssistantState):
+        self.state = state
+
+    def speak(self, text: str, priority: bool = False, cache: bool = False):
+        """Queue text for the speech worker; priority interrupts current speech.
+
+        cache=True lets fixed text be played from the audio cache.
+        """
+        self.speech.say(text, priority=priority, cache=cache)
+
+    def prompt(self, name: str, priority: bool = False):
+        """Speak one of the fixed VOICE_PROMPTS"""
+        self.speak(VOICE_PROMPTS[name], priority=priority, cache=True)
+
+    def _create_recognizer(self):
+        recognizer = sr.Recognizer()
+
+        # Improved settings for better recognition
+        recognizer.energy_threshold = 300
+        recognizer.dynamic_energy_threshold = True
+        recognizer.pause_threshold = 0.8
+        recognizer.operation_timeout = 5
+        return recognizer
+
+    def calibrate_microphone(self):
+        """Measure ambient noise once; run in the background at startup"""
+        try:
+            self.recognizer = self._create_recognizer()
+            with sr.Microphone() as source:
+                print("🎤 Calibrating microphone...")
+                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+            print("🎤 Audio systems calibrated")
+        except Exception as e:
+            logging.error(f"Microphone calibration failed: {e}")
+        finally:
+            self.calibrated.set()
+
+    def handle_command(self, command: str) -> bool:
+        """Answer one command through the speech worker; False ends the conversation"""
+        # Process command with advanced NLP; a compound question
+        # yields several intents answered together
+        intents = self.extract_intents(command)
+        asked = [intent for intent, _ in intents]
+        self.record_turn("user", command, *intents[0])
+
+        # Speak each sentence as soon as it is ready; apart from the
+        # farewell (it includes the session length) answers are fixed text
+        parts = []
+        for chunk in self.generate_response_chunks(intents, command):
+            parts.append(chunk)
+            self.speak(chunk, cache="goodbye" not in asked)
+
+        # Add to conversation history
+        self.record_turn("assistant", " ".join(parts), *intents[0])
+
+        # Check for exit conditions
+        if "goodbye" in asked:
+            # Queued behind the farewell, so no pause is needed
+            self.prompt("shutdown")
+            return False
+
+        # Suggest follow-up based on context
+        if asked[-1] in ["services", "pricing"] and self.conversation_history.total_turns < 10:
+            self.prompt("follow_up")
+        return True
+
+    def run_assistant(self, listener: Optional[ContinuousListener] = None,
+                      wake_words: Tuple[str, ...] = ("hey assistant", "computer")):
+        """Main assistant loop with enhanced features.
+
+        Runs AsyncVoiceLoop on a fresh event loop. With a ContinuousListener
+        the microphone stays open and only commands spoken after a wake word
+        are recognized.
+        """
+        print("🚀 Initializing Advanced Inonetecx Assistant...")
+        if not listener:
+            # Calibrate while the greeting is spoken instead of before it
+            threading.Thread(target=self.calibrate_microphone, name="mic-calibration", daemon=True).start()
+        self.prompt("boot")
+        self.speech.prefill(VOICE_PROMPTS.values())
+
+        welcome_msg = f"Hello! I'm your intelligent Inonetecx assistant. Today is {datetime.datetime.now().strftime('%A, %B %d, %Y')}. I'm here to help you discover how we can transform your business with cutting-edge technology solutions."
+        print(f"🤖 {welcome_msg}")
+        self.speak(welcome_msg)
+        
+        print("""
+🎯 What I can help you with:
+   • Company information and our mission
+   • Detailed service descriptions and technologies
+   • Transparent pricing and project timelines  
+   • Team expertise and certifications
+   • Our proven development process
+   • Contact information and business hours
+   • Portfolio examples and client success stories
+   • Technical specifications and requirements
+
+💡 Pro tips:
+   • Speak clearly and naturally
+   • You can ask follow-up questions
+   • Say 'open website' to visit our site
+   • Say 'goodbye' when you're ready to leave
+   • Say a wake word to interrupt me while I'm talking
+
+🎤 Ready to listen! How can I help you today?
+        """)
+
+        try:
+            asyncio.run(AsyncVoiceLoop(self, listener, wake_words).run())
+        except KeyboardInterrupt:
+            print("\n🛑 Assistant interrupted by user")
+            self.prompt("interrupted", priority=True)
+
+        # Let the farewell finish before the worker exits
+        if listener:
+            listener.stop()
+        self.speech.shutdown(finish_pending=True)
+        self.recognizer_chain.shutdown()
+        logging.info(f"Recognition latency by backend: {self.recognizer_chain.latency_summary()}")
+
+def run_in_daemon_thread(loop: asyncio.AbstractEventLoop, fn: Callable, *args) -> "asyncio.Future":
+    """Await a blocking call made on its own daemon thread.
+
+    Unlike run_in_executor, a call the loop stops waiting for (a microphone
+    read, input()) never holds up interpreter exit.
+    """
+    future = loop.create_future()
+
+    def resolve(setter, value):
+        if not future.done():
+            setter(value)
+
+    def target():
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            outcome = (future.set_exception, e)
+        else:
+            outcome = (future.set_result, result)
+        try:
+            loop.call_soon_threadsafe(resolve, *outcome)
+        except RuntimeError:
+            # The loop closed while we were blocked
+            pass
+
+    threading.Thread(target=target, name=f"async-{getattr(fn, '__name__', 'call')}", daemon=True).start()
+    return future
+
+@dataclass
+class Heard:
+    """One capture outcome passed from the capture and recognition tasks"""
+    text: Optional[str] = None
+    error: Optional[str] = None
+    # The assistant was speaking while this was captured
+    during_speech: bool = False
+
+class AsyncVoiceLoop:
+    """Asyncio conversation loop for the voice assistant.
+
+    Capture, recognition and conversation are tasks joined by queues, so
+    the next utterance is recorded and recognized while the current answer
+    is still being spoken. Speech heard while the assistant talks is taken
+    as its own echo unless it starts with a wake word; then the answer is
+    cut off (barge-in) and the rest of the utterance becomes the next
+    command. Failed captures are retried straight away, bounded by the
+    listen timeout instead of fixed sleeps, and after a few in a row the
+    user is asked to type instead.
+    """
+
+    ERROR_PROMPTS = {"timeout": "no_speech", "network": "network_error", "audio": "audio_error"}
+
+    def __init__(self, assistant: "AdvancedInonetecxAssistant", listener: Optional[ContinuousListener] = None,
+                 wake_words: Tuple[str, ...] = ("hey assistant", "computer"), listen_timeout: float = 8.0,
+                 phrase_time_limit: float = 10.0, attempts: int = 3, max_errors: int = 3):
+        self.assistant = assistant
+        self.listener = listener
+        self.wake_words = [w.lower() for w in wake_words]
+        self._wake_pattern = wake_word_pattern(self.wake_words)
+        self.listen_timeout = listen_timeout
+        self.phrase_time_limit = phrase_time_limit
+        self.attempts = attempts
+        self.max_errors = max_errors
+
+    async def run(self):
+        """Converse until goodbye or too many errors"""
+        self.loop = asyncio.get_running_loop()
+        self.audio: "asyncio.Queue" = asyncio.Queue(maxsize=2)
+        self.heard: "asyncio.Queue[Heard]" = asyncio.Queue()
+        if self.listener:
+            self.listener.on_wake = lambda: self.loop.call_soon_threadsafe(self._wake_during_speech)
+            workers = [self._follow_listener()]
+        else:
+            workers = [self._capture(), self._recognize()]
+        tasks = [self.loop.create_task(worker) for worker in workers]
+        try:
+            await self._converse()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _listen_microphone(self):
+        if self.assistant.recognizer is None:
+            self.assistant.recognizer = self.assistant._create_recognizer()
+        with sr.Microphone() as source:
+            return self.assistant.recognizer.listen(source, timeout=self.listen_timeout,
+                                                    phrase_time_limit=self.phrase_time_limit)
+
+    async def _capture(self):
+        """Record utterances into the audio queue, also while the assistant speaks"""
+        if not await run_in_daemon_thread(self.loop, self.assistant.calibrated.wait, 5):
+            logging.warning("Microphone calibration still running; listening with the default threshold")
+        speech = self.assistant.speech
+        while True:
+            during_speech = speech.busy
+            try:
+                audio = await run_in_daemon_thread(self.loop, self._listen_microphone)
+            except sr.WaitTimeoutError:
+                await self.heard.put(Heard(error="timeout", during_speech=during_speech or speech.busy))
+                continue
+            except Exception as e:
+                logging.error(f"Unexpected audio error: {e}")
+                await self.heard.put(Heard(error="audio", during_speech=during_speech or speech.busy))
+                # Don't spin on a missing or broken microphone
+                await asyncio.sleep(1)
+                continue
+            await self.audio.put((audio, during_speech or speech.busy))
+
+    async def _recognize(self):
+        """Turn queued audio into text with the recognizer chain"""
+        chain = self.assistant.recognizer_chain
+        while True:
+            audio, during_speech = await self.audio.get()
+            try:
+                # Offline and cloud backends, both language variants at once
+                result = await asyncio.wait_for(run_in_daemon_thread(self.loop, chain.recognize, audio),
+                                                timeout=chain.timeout + 1)
+            except asyncio.TimeoutError:
+                await self.heard.put(Heard(error="network", during_speech=during_speech))
+                continue
+            except Exception as e:
+                logging.error(f"Speech recognition service error: {e}")
+                await self.heard.put(Heard(error="network", during_speech=during_speech))
+                continue
+            if result:
+                await self.heard.put(Heard(text=result.text, during_speech=during_speech))
+            else:
+                await self.heard.put(Heard(error="unrecognized", during_speech=during_speech))
+
+    async def _follow_listener(self):
+        """Forward commands from a ContinuousListener (already wake-word gated)"""
+        while True:
+            result = await run_in_daemon_thread(self.loop, self.listener.next_command, 1.0)
+            if result is not None:
+                await self.heard.put(Heard(text=result.text))
+            elif self.listener.frames.closed:
+                await self.heard.put(Heard(text="exit"))
+                return
+
+    def _wake_during_speech(self):
+        if self.assistant.speech.busy:
+            self._barge_in()
+
+    def _barge_in(self):
+        self.assistant.speech.interrupt()
+        METRICS.inc("barge_in_total")
+        print("✋ Interrupted")
+
+    def _after_wake_word(self, text: str) -> Optional[str]:
+        """The text following a leading wake word, or None without one"""
+        match = self._wake_pattern.match(text.lower())
+        return match.group(1).strip(" ,.!?") if match else None
+
+    def _drain_heard(self):
+        while not self.heard.empty():
+            self.heard.get_nowait()
+
+    async def _read_typed(self) -> str:
+        try:
+            return (await run_in_daemon_thread(self.loop, input, "👤 You (type): ")).lower()
+        except (KeyboardInterrupt, EOFError):
+            return "exit"
+
+    async def _converse(self):
+        assistant = self.assistant
+        failures = 0
+        consecutive_errors = 0
+        while True:
+            assistant.state = AssistantState.LISTENING
+            heard = await self.heard.get()
+            assistant.state = AssistantState.PROCESSING
+            command = None
+
+            if heard.error:
+                if heard.during_speech:
+                    # Silence or noise while we talk is expected
+                    continue
+                failures += 1
+                METRICS.inc("recognition_retries_total")
+                if failures % self.attempts:
+                    if heard.error in self.ERROR_PROMPTS:
+                        assistant.prompt(self.ERROR_PROMPTS[heard.error], priority=True)
+                    continue
+                assistant.prompt("text_fallback", priority=True)
+                command = await self._read_typed()
+                self._drain_heard()
+            elif heard.during_speech:
+                command = self._after_wake_word(heard.text)
+                if command is None:
+                    METRICS.inc("echo_discarded_total")
+                    continue
+                self._barge_in()
+                if not command:
+                    continue
+            else:
+                command = heard.text.lower()
+                after_wake_word = self._after_wake_word(command)
+                if after_wake_word == "":
+                    # Just the wake word: the user is getting our attention
+                    print("👂 Yes?")
+                    continue
+                command = after_wake_word or command
+
+            if not command.strip():
+                consecutive_errors += 1
+                METRICS.inc("conversation_errors_total", kind="empty_command")
+                METRICS.set_gauge("consecutive_errors", consecutive_errors)
+                if consecutive_errors >= self.max_errors:
+                    assistant.prompt("persistent_errors", priority=True)
+                    return
+                assistant.prompt("not_understood", priority=True)
+                continue
+
+            failures = 0
+            consecutive_errors = 0
+            METRICS.set_gauge("consecutive_errors", 0)
+            print(f"👤 You: {command}")
+            try:
+                if not assistant.handle_command(command):
+                    return
+            except Exception as e:
+                logging.error(f"Unexpected error in main loop: {e}")
+                assistant.prompt("technical_issue", priority=True)
+                consecutive_errors += 1
+                METRICS.inc("conversation_errors_total", kind="exception")
+                METRICS.set_gauge("consecutive_errors", consecutive_errors)
+                if consecutive_errors >= self.max_errors:
+                    return
+
+class SessionStore:
+    """Durable tier behind SessionManager's in-memory sessions.
+
+    Holds each session's dump_state() bytes with a version that grows on
+    every save, so a worker can tell when another process has moved a
+    session on since it last loaded it. save() is a compare-and-set on
+    that version, so two workers can never both write over the same copy.
+    """
+
+    def load(self, session_id: str) -> Optional[Tuple[int, bytes]]:
+        """(version, state) of a stored session, or None"""
+        raise NotImplementedError
+
+    def version(self, session_id: str) -> Optional[int]:
+        raise NotImplementedError
+
+    def save(self, session_id: str, version: int, state: bytes) -> bool:
+        """Store state as `version` if the stored copy is still version - 1
+        or missing; False when another process saved first"""
+        raise NotImplementedError
+
+    def delete(self, session_id: str):
+        raise NotImplementedError
+
+    def prune(self, max_age: float) -> int:
+        """Delete sessions not saved for max_age seconds; returns how many"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class SQLiteSessionStore(SessionStore):
+    """Sessions in a local SQLite file that several worker processes can share"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            # WAL lets readers in other processes run alongside a writer
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "id TEXT PRIMARY KEY, version INTEGER NOT NULL, updated REAL NOT NULL, state BLOB NOT NULL"
+                ") WITHOUT ROWID"
+            )
+
+    def load(self, session_id: str) -> Optional[Tuple[int, bytes]]:
+        with self._lock:
+            row = self._conn.execute("SELECT version, state FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return (row[0], bytes(row[1])) if row else None
+
+    def version(self, session_id: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return row[0] if row else None
+
+    def save(self, session_id: str, version: int, state: bytes) -> bool:
+        now = time.time()
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE sessions SET version = ?, updated = ?, state = ? WHERE id = ? AND version = ?",
+                (version, now, state, session_id, version - 1)
+            ).rowcount
+            if updated:
+                return True
+            # Only inserts when the row is missing (new, or pruned since the last load)
+            return self._conn.execute(
+                "INSERT OR IGNORE INTO sessions (id, version, updated, state) VALUES (?, ?, ?, ?)",
+                (session_id, version, now, state)
+            ).rowcount == 1
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def prune(self, max_age: float) -> int:
+        with self._lock:
+            return self._conn.execute("DELETE FROM sessions WHERE updated < ?", (time.time() - max_age,)).rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class SessionManager:
+    """Thread-safe registry of chat sessions sharing one knowledge base.
+
+    Live sessions form an in-memory LRU tier. With a SessionStore, a
+    session missing from memory is loaded from the store on its first
+    request, and save() writes it back after every turn. Another worker
+    process can therefore resume it, and a copy that another process has
+    saved since is reloaded.
+    """
+
+    # Seconds between deletions of long-unused sessions from the store
+    PRUNE_INTERVAL = 3600
+    # Saves tried before giving up when other processes keep saving first
+    SAVE_ATTEMPTS = 5
+
+    def __init__(self, store: KnowledgeBaseStore, max_sessions: int = 1000, idle_timeout: float = 1800,
+                 session_store: Optional[SessionStore] = None, retention: float = 7 * 24 * 3600):
+        self.store = store
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.session_store = session_store
+        self.retention = retention
+        self.sessions: "OrderedDict[str, InonetecxChatSession]" = OrderedDict()
+        self.lock = threading.Lock()
+        self._last_prune = 0.0
+
+    def get(self, session_id: Optional[str]) -> Tuple[str, InonetecxChatSession]:
+        """Return the session for an id, loading or creating it if needed"""
+        prune = False
+        with self.lock:
+            session = self.sessions.get(session_id) if session_id else None
+            if session is not None:
+                self.sessions.move_to_end(session_id)
+            else:
+                prune = self._evict_idle()
+                session_id = session_id or uuid.uuid4().hex
+                session = InonetecxChatSession(self.store)
+                self.sessions[session_id] = session
+        # Store I/O runs outside the manager lock so one slow read never stalls other sessions
+        if self.session_store is not None:
+            self._refresh(session_id, session)
+            if prune:
+                pruned = self.session_store.prune(self.retention)
+                if pruned:
+                    logging.info(f"Pruned {pruned} stored sessions")
+        return session_id, session
+
+    def _refresh(self, session_id: str, session: InonetecxChatSession):
+        """Load the stored state if it is newer than the session's.
+
+        Turns a concurrent request has added but not saved yet are replayed
+        on top, as in save().
+        """
+        stored_version = self.session_store.version(session_id)
+        if stored_version is None or stored_version == session.state_version:
+            return
+        loaded = self.session_store.load(session_id)
+        if loaded is None:
+            return
+        version, state = loaded
+        try:
+            with session.lock:
+                # A concurrent request may have loaded or saved it meanwhile
+                if version == session.state_version:
+                    return
+                session.rebase(state)
+                session.state_version = version
+            METRICS.inc("session_loads_total")
+        except (ValueError, struct.error, UnicodeDecodeError) as e:
+            logging.error(f"Discarding unreadable state of session {session_id}: {e}")
+
+    def save(self, session_id: str, session: InonetecxChatSession):
+        """Write a session through to the store after a turn.
+
+        When another process saved the session first, its copy is loaded,
+        this session's new turns are replayed on top, and the save retried.
+        """
+        if self.session_store is None:
+            return
+        start = time.perf_counter()
+        with session.lock:
+            for _ in range(self.SAVE_ATTEMPTS):
+                version = session.state_version + 1
+                try:
+                    if self.session_store.save(session_id, version, session.dump_state()):
+                        session.state_version = version
+                        session.synced_turns = session.conversation_history.total_turns
+                        break
+                    METRICS.inc("session_save_conflicts_total")
+                    loaded = self.session_store.load(session_id)
+                except sqlite3.Error as e:
+                    logging.error(f"Could not save session {session_id}: {e}")
+                    break
+                if loaded is None:
+                    # Deleted since the conflict; the next attempt inserts it
+                    session.state_version = 0
+                    continue
+                stored_version, state = loaded
+                try:
+                    session.rebase(state)
+                except (ValueError, struct.error, UnicodeDecodeError) as e:
+                    logging.error(f"Overwriting unreadable state of session {session_id}: {e}")
+                session.state_version = stored_version
+            else:
+                logging.error(f"Could not save session {session_id}: still conflicting after {self.SAVE_ATTEMPTS} attempts")
+        METRICS.observe("session_save", time.perf_counter() - start)
+
+    def close(self):
+        if self.session_store is not None:
+            self.session_store.close()
+
+    def _evict_idle(self) -> bool:
+        """Drop expired sessions, then the least recently used if still full.
+
+        Sessions are kept in recency order, so the scan stops at the first
+        one that is still active. Evicted sessions are already in the
+        store, if there is one. Returns whether the store is due a prune.
+        """
+        now = time.monotonic()
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if now - session.last_active <= self.idle_timeout:
+                break
+            self.sessions.popitem(last=False)
+        while len(self.sessions) >= self.max_sessions:
+            self.sessions.popitem(last=False)
+        if self.session_store is None or now - self._last_prune <= self.PRUNE_INTERVAL:
+            return False
+        self._last_prune = now
+        return True
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+def intents_payload(intents: List[Tuple[str, Dict]]) -> Dict:
+    """The first intent as "intent"/"entities" plus every pair under "intents" """
+    intent, entities = intents[0]
+    return {
+        "intent": intent,
+        "entities": entities,
+        "intents": [{"intent": i, "entities": e} for i, e in intents]
+    }
+
+class ChatRequestHandler(BaseHTTPRequestHandler):
+    """REST API for the web interface: /api/status, /api/chat, /api/chat/stream, /api/clear"""
+
+    static_files = {
+        "/": ("html.html", "text/html; charset=utf-8"),
+        "/html.html": ("html.html", "text/html; charset=utf-8"),
+        "/script.js": ("script.js", "application/javascript; charset=utf-8"),
+        "/style.css": ("style.css", "text/css; charset=utf-8")
+    }
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+    def _send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        data = json.loads(self.rfile.read(length).decode("utf-8"))
+        if not isinstance(data, dict):
+            raise ValueError("request body must be a JSON object")
+        return data
+
+    def _send_event(self, event: str, payload: Dict):
+        self.wfile.write(f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def _stream_chat(self, session_id: str, session: InonetecxChatSession, message: str):
+        """Send the response as server-sent events, one per sentence"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        try:
+            intents, chunks = session.respond_stream(message)
+            self._send_event("meta", dict(intents_payload(intents), session_id=session_id))
+            for chunk in chunks:
+                self._send_event("chunk", {"text": chunk})
+            self.server.sessions.save(session_id, session)
+            self._send_event("done", {})
+        except (BrokenPipeError, ConnectionResetError):
+            logging.info(f"Client disconnected from stream for session {session_id}")
+        except Exception as e:
+            logging.error(f"Chat pipeline error: {e}")
+            self._send_event("error", {"error": "internal error"})
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type, X-Session-Id")
+        self.end_headers()
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/api/status":
+            self._send_json(200, {"status": "online", "sessions": len(self.server.sessions)})
+        elif path == "/metrics":
+            METRICS.set_gauge("active_sessions", len(self.server.sessions))
+            body = METRICS.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif path in self.static_files:
+            filename, content_type = self.static_files[path]
+            try:
+                with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), filename), "rb") as f:
+                    body = f.read()
+            except OSError:
+                self._send_json(404, {"error": "not found"})
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        try:
+            data = self._read_json()
+        except ValueError as e:
+            self._send_json(400, {"error": f"invalid JSON: {e}"})
+            return
+
+        session_id = data.get("session_id") or self.headers.get("X-Session-Id")
+        if path == "/api/chat":
+            message = str(data.get("message", "")).strip()
+            if not message:
+                self._send_json(400, {"error": "message is required"})
+                return
+            session_id, session = self.server.sessions.get(session_id)
+            try:
+                response, intents = session.respond(message)
+                self.server.sessions.save(session_id, session)
+            except Exception as e:
+                logging.error(f"Chat pipeline error: {e}")
+                self._send_json(500, {"error": "internal error", "session_id": session_id})
+                return
+            self._send_json(200, dict(intents_payload(intents), response=response, session_id=session_id))
+        elif path == "/api/chat/stream":
+            message = str(data.get("message", "")).strip()
+            if not message:
+                self._send_json(400, {"error": "message is required"})
+                return
+            session_id, session = self.server.sessions.get(session_id)
+            self._stream_chat(session_id, session, message)
+        elif path == "/api/clear":
+            session_id, session = self.server.sessions.get(session_id)
+            session.clear()
+            self.server.sessions.save(session_id, session)
+            self._send_json(200, {"status": "cleared", "session_id": session_id})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+class ChatServer(HTTPServer):
+    """HTTP server that hands each connection to a bounded thread pool"""
+
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], sessions: SessionManager, max_workers: int = 32):
+        super().__init__(address, ChatRequestHandler)
+        self.sessions = sessions
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chat")
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
+        self.sessions.close()
+
+def run_server(host: str = "127.0.0.1", port: int = 5000, max_workers: int = 32, session_db: Optional[str] = None):
+    """Serve the text chat API; no TTS or microphone is touched here.
+
+    With session_db, sessions persist in that SQLite file, so they survive
+    restarts and can be shared by several server processes.
+    """
+    session_store = SQLiteSessionStore(session_db) if session_db else None
+    sessions = SessionManager(default_knowledge_base_store(), session_store=session_store)
+    server = ChatServer((host, port), sessions, max_workers=max_workers)
+    print(f"🌐 Inonetecx assistant API running at http://{host}:{port}")
+    logging.info(f"Chat server listening on {host}:{port} with {max_workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Server stopped by user")
+    finally:
+        server.server_close()
+
+# Column or key holding the utterance in batch input files
+BATCH_TEXT_FIELDS = ("text", "utterance", "message", "transcript")
+BATCH_CSV_FIELDS = ["id", "text", "intent", "service", "entities", "response", "confidence", "backend", "error"]
+
+def iter_batch_records(path: str) -> Iterator[Dict]:
+    """Stream utterance records from a JSONL or CSV file, or a directory of WAV files.
+
+    Input rows are passed through with the utterance under "text" and an
+    "id" (the row number if missing). A JSONL line that is not a JSON
+    object becomes {"id": row number, "error": ...} rather than ending the
+    run. WAV records carry the file path in "audio" and are transcribed by
+    the worker that processes them.
+    """
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.lower().endswith(".wav"):
+                yield {"id": os.path.splitext(name)[0], "audio": os.path.join(path, name)}
+        return
+
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            rows = csv.DictReader(f)
+        else:
+            rows = _jsonl_rows(f)
+        for number, row in enumerate(rows, 1):
+            if isinstance(row, ValueError):
+                yield {"id": number, "error": str(row)}
+                continue
+            record = dict(row)
+            record["text"] = next((row[field] for field in BATCH_TEXT_FIELDS if row.get(field)), "")
+            record.setdefault("id", number)
+            yield record
+
+def _jsonl_rows(lines: Iterable[str]) -> Iterator[Union[Dict, ValueError]]:
+    """The object on each non-blank line, or the ValueError explaining why there is none"""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"invalid JSON: {e}")
+            continue
+        yield row if isinstance(row, dict) else ValueError(f"expected a JSON object, got {type(row).__name__}")
+
+# Per-process state of batch workers, set up by _init_batch_worker
+_batch_session: Optional[InonetecxChatSession] = None
+_batch_recognizer: Optional[RecognizerChain] = None
+_batch_vosk_model: Optional[str] = None
+
+def _init_batch_worker(knowledge_base: Optional[str], vosk_model: Optional[str]):
+    global _batch_session, _batch_vosk_model
+    _batch_session = InonetecxChatSession(store=default_knowledge_base_store(knowledge_base))
+    _batch_vosk_model = vosk_model
+
+def _init_batch_process(knowledge_base: Optional[str], vosk_model: Optional[str]):
+    # A forked child has no log listener thread; write to the handlers directly
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    for handler in _log_handlers:
+        root.addHandler(handler)
+    _init_batch_worker(knowledge_base, vosk_model)
+
+def _transcribe_wav(path: str) -> Optional[RecognitionResult]:
+    global _batch_recognizer
+    if _batch_recognizer is None:
+        _batch_recognizer = build_recognizer_chain(_batch_vosk_model)
+    with sr.AudioFile(path) as source:
+        audio = sr.Recognizer().record(source)
+    return _batch_recognizer.recognize(audio)
+
+def _process_batch_record(record: Dict) -> Dict:
+    result = dict(record)
+    if "error" in record:
+        return result
+    try:
+        if "audio" in record:
+            transcript = _transcribe_wav(record["audio"])
+            result["text"] = transcript.text if transcript else ""
+            if transcript:
+                result["confidence"] = transcript.confidence
+                result["backend"] = transcript.backend
+        command = str(result.get("text") or "").strip().lower()
+        if not command:
+            result["error"] = "no utterance"
+            return result
+        intents = _batch_session.extract_intents(command)
+        result.update(intents_payload(intents))
+        result["response"] = _batch_session.compose_response(intents, command)
+    except Exception as e:
+        logging.error(f"Batch record {record.get('id')} failed: {e}")
+        result["error"] = str(e)
+    return result
+
+def _process_batch_chunk(records: List[Dict]) -> List[Dict]:
+    return [_process_batch_record(record) for record in records]
+
+def _chunked(items: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def process_batch(records: Iterable[Dict], workers: Optional[int] = None, chunk_size: int = 64,
+                  knowledge_base: Optional[str] = None, vosk_model: Optional[str] = None) -> Iterator[Dict]:
+    """Run utterance records through the text pipeline, yielding results in input order.
+
+    Records are processed in chunks by a pool of worker processes, each
+    with its own stateless chat session. At most two chunks per worker are
+    in flight, so memory stays bounded however long the input is.
+    With workers=1 everything runs in this process.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunked(records, chunk_size)
+    if workers == 1:
+        _init_batch_worker(knowledge_base, vosk_model)
+        for chunk in chunks:
+            yield from _process_batch_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_batch_process,
+                             initargs=(knowledge_base, vosk_model)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_process_batch_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def run_batch(input_path: str, output_path: Optional[str] = None, workers: Optional[int] = None,
+              chunk_size: int = 64, knowledge_base: Optional[str] = None, vosk_model: Optional[str] = None) -> int:
+    """Process a JSONL/CSV file or WAV directory and write one result per record.
+
+    Results go to output_path (CSV if it ends in .csv, JSONL otherwise) or
+    to stdout. Returns the number of records that failed.
+    """
+    out = open(output_path, "w", encoding="utf-8", newline="") if output_path else sys.stdout
+    csv_writer = None
+    if output_path and output_path.lower().endswith(".csv"):
+        csv_writer = csv.DictWriter(out, BATCH_CSV_FIELDS, extrasaction="ignore")
+        csv_writer.writeheader()
+
+    start = time.perf_counter()
+    total = failed = 0
+    try:
+        for result in process_batch(iter_batch_records(input_path), workers, chunk_size, knowledge_base, vosk_model):
+            total += 1
+            failed += "error" in result
+            METRICS.inc("batch_records_total", outcome="error" if "error" in result else "ok")
+            if csv_writer:
+                entities = result.get("entities") or {}
+                csv_writer.writerow(dict(result, service=entities.get("service", ""),
+                                         entities=json.dumps(entities, ensure_ascii=False)))
+            else:
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if output_path:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    logging.info(f"Batch processed {total} records ({failed} failed) in {elapsed:.1f}s")
+    print(f"📦 Processed {total} records ({failed} failed) in {elapsed:.1f}s "
+          f"({total / elapsed if elapsed else 0:.0f} records/s)", file=sys.stderr)
+    return failed
+
+def main():
+    """Initialize and run the advanced assistant"""
+    parser = argparse.ArgumentParser(description="Inonetecx AI assistant")
+    parser.add_argument("mode", nargs="?", choices=["server", "voice", "batch"],
+                        help="web API server, voice interface or offline batch processing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=32, help="request handler threads in server mode")
+    parser.add_argument("--knowledge-base", help="path to the knowledge base JSON file")
+    parser.add_argument("--session-db", default=os.environ.get("INONETECX_SESSION_DB"),
+                        help="server mode: SQLite file for persistent sessions, shareable between server processes")
+    parser.add_argument("--metrics-file", help="write a JSON metrics snapshot to this file periodically")
+    parser.add_argument("--vosk-model", help="path to a Vosk model for offline speech recognition")
+    parser.add_argument("--continuous", action="store_true",
+                        help="voice mode: keep the microphone open and respond after a wake word")
+    parser.add_argument("--cloud-wake-word", action="store_true",
+                        help="--continuous without a Vosk model: check wake words with Google recognition "
+                             "(sends every speech segment to the cloud)")
+    parser.add_argument("--wake-word", action="append", dest="wake_words",
+                        help="wake word for --continuous and for interrupting speech (repeatable; default: 'hey assistant', 'computer')")
+    parser.add_argument("--audio-cache", default=os.environ.get("INONETECX_AUDIO_CACHE", AUDIO_CACHE_PATH),
+                        help="voice mode: directory for cached synthesized prompts and answers")
+    parser.add_argument("--audio-cache-mb", type=int, default=64, help="voice mode: audio cache size limit (0 disables it)")
+    parser.add_argument("--input", help="batch mode: JSONL or CSV file of utterances, or a directory of WAV files")
+    parser.add_argument("--output", help="batch mode: results file (.csv or JSONL; default: stdout)")
+    parser.add_argument("--processes", type=int, help="batch mode: worker processes (default: one per core)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="batch mode: records per worker task")
+    args = parser.parse_args()
+    if args.mode == "batch" and not args.input:
+        parser.error("batch mode needs --input")
+    if args.mode == "batch" and not (os.path.isdir(args.input) or os.access(args.input, os.R_OK)):
+        parser.error(f"cannot read --input {args.input}")
+    if args.continuous and not (args.vosk_model or os.environ.get("INONETECX_VOSK_MODEL") or args.cloud_wake_word):
+        parser.error("--continuous needs --vosk-model (or INONETECX_VOSK_MODEL) for local wake words, "
+                     "or --cloud-wake-word")
+
+    mode = args.mode
+    if mode is None:
+        print("Choose mode:\n   1. Web Interface (Recommended)\n   2. Voice Interface")
+        try:
+            mode = "voice" if input("Enter 1 or 2: ").strip() == "2" else "server"
+        except (KeyboardInterrupt, EOFError):
+            print("\nProgram terminated by user. Goodbye! 👋")
+            return
+
+    if mode == "batch":
+        if args.metrics_file:
+            METRICS.start_json_dump(args.metrics_file)
+        try:
+            failed = run_batch(args.input, args.output, args.processes, args.chunk_size,
+                               args.knowledge_base, args.vosk_model)
+        except OSError as e:
+            # Unreadable input or unwritable output found after the checks above
+            print(f"Batch failed: {e}", file=sys.stderr)
+            sys.exit(1)
+        if args.metrics_file:
+            # Most runs end before the first periodic dump
+            METRICS.write_json(args.metrics_file)
+        sys.exit(1 if failed else 0)
+
+    try:
+        default_knowledge_base_store(args.knowledge_base).watch()
+        if args.metrics_file:
+            METRICS.start_json_dump(args.metrics_file)
+        if mode == "server":
+            run_server(args.host, args.port, args.workers, args.session_db)
+            return
+        audio_cache = None
+        if args.audio_cache_mb > 0:
+            audio_cache = AudioCache(args.audio_cache, args.audio_cache_mb * 1024 * 1024)
+        assistant = AdvancedInonetecxAssistant(recognizer_chain=build_recognizer_chain(args.vosk_model),
+                                               audio_cache=audio_cache)
+        listener = None
+        wake_words = args.wake_words or ["hey assistant", "computer"]
+        if args.continuous:
+            detector = build_wake_word_detector(wake_words, args.vosk_model, args.cloud_wake_word)
+            listener = ContinuousListener(assistant.recognizer_chain, detector)
+            listener.start_microphone()
+        assistant.run_assistant(listener, tuple(wake_words))
+    except KeyboardInterrupt:
+        print("\nProgram terminated by user. Goodbye! 👋")
+    except Exception as e:
+        logging.critical(f"Critical error: {e}")
+        print(f"Critical error occurred: {e}")
+        print("Please check the logs and restart the application.")
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,6 +5,9 @@ document.addEventListener('DOMContentLoaded', function() {
     const conversationMessages = document.getElementById('conversationMessages');
     const commandButtons = document.querySelectorAll('.command-btn');
 
+    // Served by the backend: same origin. Opened as a file: local server.
+    const apiBase = window.location.protocol.startsWith('http') ? '' : 'http://127.0.0.1:5000';
+
     startBtn.addEventListener('click', function() {
         startBtn.disabled = true;
         stopBtn.disabled = false;
@@ -25,6 +28,11 @@ document.addEventListener('DOMContentLoaded', function() {
 
     clearChat.addEventListener('click', function() {
         conversationMessages.innerHTML = '';
+        fetch(`${apiBase}/api/clear`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ session_id: sessionStorage.getItem('sessionId') })
+        }).catch(() => {});
         addMessage('assistant', 'Hello! I\'m your Inonetecx AI assistant. How can I help you today?');
     });
 
@@ -33,31 +41,84 @@ document.addEventListener('DOMContentLoaded', function() {
             const command = this.getAttribute('data-command');
 
             addMessage('user', command);
-            
-            setTimeout(function() {
-                let response = '';
-
-                switch (command) {
-                    case 'about company':
-                        response = 'Inonetecx is a technology company specializing in AI solutions, web development, and digital services. We help businesses transform with cutting-edge technology.';
-                        break;
-                    case 'services':
-                        response = 'We offer web development, AI voice assistants, cloud services, and digital marketing. Our solutions are tailored to meet your specific business needs.';
-                        break;
-                    case 'pricing':
-                        response = 'Our pricing varies based on project requirements. Web development starts at Rs 50,000, AI voice assistants at Rs 40,000, cloud services at Rs 30,000/month, and digital marketing at Rs 25,000/month.';
-                        break;
-                    case 'contact information':
-                        response = 'You can reach us at info@inonetecx.com or call us at +1 647-493-5614 (Canada). Our office is open from 9 AM to 5 PM, Monday through Friday.';
-                        break;
-                    default:
-                        response = 'I\'m not sure how to help with that. Can you please rephrase your question?';
-                }
-                addMessage('assistant', response);
-            }, 1500);
+            streamReply(command).catch(function() {
+                // Backend not running: fall back to the built-in answers
+                addMessage('assistant', offlineResponse(command));
+            });
         });
     });
 
+    async function streamReply(command) {
+        const response = await fetch(`${apiBase}/api/chat/stream`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ message: command, session_id: sessionStorage.getItem('sessionId') })
+        });
+        if (!response.ok || !response.body) {
+            throw new Error(`Chat request failed: ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let paragraph = null;
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) {
+                break;
+            }
+            buffer += decoder.decode(value, { stream: true });
+
+            // Server-sent events are separated by a blank line
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const event = parseEvent(buffer.slice(0, boundary));
+                buffer = buffer.slice(boundary + 2);
+
+                if (event.type === 'meta') {
+                    sessionStorage.setItem('sessionId', event.data.session_id);
+                } else if (event.type === 'chunk') {
+                    if (paragraph === null) {
+                        paragraph = addMessage('assistant', event.data.text);
+                    } else {
+                        paragraph.textContent += ' ' + event.data.text;
+                        conversationMessages.scrollTop = conversationMessages.scrollHeight;
+                    }
+                } else if (event.type === 'error') {
+                    addMessage('assistant', 'Sorry, something went wrong. Please try again.');
+                }
+            }
+        }
+    }
+
+    function parseEvent(block) {
+        const event = { type: 'message', data: {} };
+        block.split('\n').forEach(line => {
+            if (line.startsWith('event: ')) {
+                event.type = line.slice(7);
+            } else if (line.startsWith('data: ')) {
+                event.data = JSON.parse(line.slice(6));
+            }
+        });
+        return event;
+    }
+
+    function offlineResponse(command) {
+        switch (command) {
+            case 'about company':
+                return 'Inonetecx is a technology company specializing in AI solutions, web development, and digital services. We help businesses transform with cutting-edge technology.';
+            case 'services':
+                return 'We offer web development, AI voice assistants, cloud services, and digital marketing. Our solutions are tailored to meet your specific business needs.';
+            case 'pricing':
+                return 'Our pricing varies based on project requirements. Web development starts at Rs 50,000, AI voice assistants at Rs 40,000, cloud services at Rs 30,000/month, and digital marketing at Rs 25,000/month.';
+            case 'contact information':
+                return 'You can reach us at info@inonetecx.com or call us at +1 647-493-5614 (Canada). Our office is open from 9 AM to 5 PM, Monday through Friday.';
+            default:
+                return 'I\'m not sure how to help with that. Can you please rephrase your question?';
+        }
+    }
+
     function addMessage(sender, text) {
         const messageDiv = document.createElement('div');
         messageDiv.className = `message ${sender}`;
@@ -88,5 +149,7 @@ document.addEventListener('DOMContentLoaded', function() {
         conversationMessages.appendChild(messageDiv);
 
         conversationMessages.scrollTop = conversationMessages.scrollHeight;
+
+        return paragraph;
     }
 });
\ No newline at end of file
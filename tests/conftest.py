@@ -0,0 +1,19 @@
+"""Fixtures shared by the tests"""
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture(scope="session")
+def backend():
+    """'inonetecx backend.py' as a module (the file name is not a valid module name)"""
+    if "inonetecx_backend" in sys.modules:
+        return sys.modules["inonetecx_backend"]
+    spec = importlib.util.spec_from_file_location("inonetecx_backend", os.path.join(ROOT, "inonetecx backend.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,27 @@
+"""Batch mode input handling"""
+import sys
+
+import pytest
+
+def test_bad_jsonl_lines_become_error_records(backend, tmp_path):
+    path = tmp_path / "chats.jsonl"
+    path.write_text('{"text": "hello"}\n{bad json\n[1, 2]\n\n{"id": "x", "message": "hi"}\n', encoding="utf-8")
+
+    records = list(backend.iter_batch_records(str(path)))
+
+    assert [record["id"] for record in records] == [1, 2, 3, "x"]
+    assert records[0]["text"] == "hello" and "error" not in records[0]
+    assert records[1]["error"].startswith("invalid JSON")
+    assert records[2]["error"] == "expected a JSON object, got list"
+
+@pytest.mark.parametrize("args", [["--input", "missing.jsonl"], ["--input", "{tmp}/chats.jsonl", "--output", "{tmp}/no/such/dir.jsonl"]])
+def test_unusable_paths_exit_with_a_message(backend, tmp_path, monkeypatch, capsys, args):
+    (tmp_path / "chats.jsonl").write_text('{"text": "hello"}\n', encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["backend", "batch", "--processes", "1"] + [a.format(tmp=tmp_path) for a in args])
+
+    with pytest.raises(SystemExit) as exit_info:
+        backend.main()
+
+    assert exit_info.value.code != 0
+    assert "Traceback" not in capsys.readouterr().err
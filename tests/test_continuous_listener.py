@@ -0,0 +1,83 @@
+"""ContinuousListener wake-word gating, fed from WAV files"""
+import math
+import struct
+import wave
+
+import pytest
+
+RATE = 16000
+
+def write_wav(path, pattern):
+    """Mono 16-bit WAV of alternating (seconds, loud) spans"""
+    samples = []
+    for seconds, loud in pattern:
+        amplitude = 8000 if loud else 0
+        samples += [int(amplitude * math.sin(2 * math.pi * 440 * i / RATE)) for i in range(int(seconds * RATE))]
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+    return str(path)
+
+def listener(backend, wake_transcripts, command_transcripts, detector=None):
+    pytest.importorskip("speech_recognition")
+    chain = backend.RecognizerChain([backend.ScriptedRecognizerBackend(command_transcripts)])
+    detector = detector or backend.TranscriptWakeWordDetector(
+        ["hey assistant", "computer"], backend.ScriptedRecognizerBackend(wake_transcripts))
+    return backend.ContinuousListener(chain, detector, sample_rate=RATE)
+
+@pytest.fixture
+def one_phrase(tmp_path):
+    return write_wav(tmp_path / "one.wav", [(0.3, False), (0.6, True), (1.0, False)])
+
+@pytest.fixture
+def two_phrases(tmp_path):
+    return write_wav(tmp_path / "two.wav", [(0.3, False), (0.6, True), (1.0, False), (0.6, True), (1.0, False)])
+
+def test_command_in_the_same_breath(backend, one_phrase):
+    heard = listener(backend, ["Computer, what are your prices?"], [])
+    heard.feed_wav(one_phrase)
+
+    result = heard.next_command(timeout=5)
+
+    assert result.text == "what are your prices"
+    assert heard.wake_detections == 1
+    assert heard.recognition_calls == 0
+
+def test_wake_word_alone_arms_for_the_next_phrase(backend, two_phrases):
+    heard = listener(backend, ["computer"], ["how much does it cost"])
+    heard.feed_wav(two_phrases)
+
+    result = heard.next_command(timeout=5)
+
+    assert result.text == "how much does it cost"
+    assert heard.wake_detections == 1
+    assert heard.recognition_calls == 1
+
+def test_wake_word_inside_a_sentence_is_ignored(backend, one_phrase):
+    heard = listener(backend, ["I need a computer vision system"], ["should not be used"])
+    heard.feed_wav(one_phrase)
+
+    assert heard.next_command(timeout=5) is None
+    assert heard.wake_detections == 0
+    assert heard.recognition_calls == 0
+
+def test_keyword_spotter_command_is_transcribed_by_the_chain(backend, one_phrase):
+    class Spotter(backend.WakeWordDetector):
+        """Like the Vosk detector: knows more speech follows, not what it says"""
+        def detect_command(self, audio):
+            return backend.RecognitionResult("[unk] [unk]", 1.0, "spotter")
+
+    heard = listener(backend, [], ["computer what services do you offer"], Spotter(["computer"]))
+    heard.feed_wav(one_phrase)
+
+    assert heard.next_command(timeout=5).text == "what services do you offer"
+    assert heard.recognition_calls == 1
+
+def test_cloud_wake_words_are_opt_in(backend, monkeypatch):
+    monkeypatch.delenv("INONETECX_VOSK_MODEL", raising=False)
+    with pytest.raises(RuntimeError):
+        backend.build_wake_word_detector(["computer"])
+    detector = backend.build_wake_word_detector(["computer"], cloud_fallback=True)
+    assert isinstance(detector, backend.TranscriptWakeWordDetector)
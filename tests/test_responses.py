@@ -0,0 +1,48 @@
+"""Response rendering and caching"""
+import pytest
+
+@pytest.fixture
+def session(backend):
+    return backend.InonetecxChatSession(backend.default_knowledge_base_store(),
+                                        response_cache=backend.ResponseCache())
+
+def test_technology_answers_from_service_record(session):
+    response, intents = session.respond("which programming languages for mobile")
+    assert intents == [("technology", {"service": "mobile"})]
+    assert "Flutter" in response and "₹" not in response
+
+def test_portfolio_does_not_use_retrieval(session):
+    response, intents = session.respond("how many projects have you done")
+    assert intents[0][0] == "portfolio"
+    assert "₹" not in response
+
+def test_cached_technology_answer_does_not_depend_on_wording(session):
+    first, _ = session.respond("what tools do you use")
+    second, _ = session.respond("what languages do you use")
+    assert first == second
+    assert "Digital Marketing Services: Google Ads" in first and "Web Development: React" in first
+
+def test_retrieval_answers_are_not_cached(session):
+    flutter, _ = session.respond("do you use flutter")
+    pytorch, _ = session.respond("tensorflow or pytorch")
+    assert "Flutter" in flutter
+    assert "PyTorch" in pytorch
+
+@pytest.mark.parametrize("question", ["what does a cloud setup start from", "do you run ppc campaigns",
+                                      "what is inonetecx"])
+def test_retrieval_answer_has_single_periods(backend, session, question):
+    response, intents = session.respond(question)
+    assert intents[0][0] == "unknown"
+    assert response.startswith("Here's what I found")
+    assert ".." not in response
+    assert list(backend.split_sentences(response))[-1] == "Is there anything else you'd like to know?"
+
+def test_unmatched_clause_of_compound_question_is_answered_from_knowledge_base(session):
+    response, intents = session.respond("do you use flutter and how much is a website")
+    assert intents == [("pricing", {"service": "web"}), ("unknown", {"question": "do you use flutter"})]
+    assert "₹15,000" in response and "Flutter" in response
+
+def test_unanswerable_clause_is_left_out(session):
+    response, intents = session.respond("please, what services do you offer")
+    assert intents[0] == ("services", {})
+    assert "I'd love to help" not in response
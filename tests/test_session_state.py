@@ -0,0 +1,101 @@
+"""Session state round trips through dump_state/load_state and the SQLite store"""
+import pytest
+
+QUESTIONS = [
+    "what services do you offer",
+    "how much does a website cost",
+    "how long does a mobile app take",
+    "who are your developers",
+]
+
+@pytest.fixture
+def session(backend):
+    """A session whose 4-turn history has already evicted and summarized turns"""
+    session = backend.InonetecxChatSession(backend.default_knowledge_base_store(), history_size=4)
+    for question in QUESTIONS:
+        session.respond(question)
+    return session
+
+def turns(session):
+    return [(t.role, t.text, t.intent, t.entity, t.timestamp) for t in session.conversation_history]
+
+def test_round_trip_at_full_capacity(backend, session):
+    assert len(session.conversation_history) == session.conversation_history.capacity
+
+    restored = backend.InonetecxChatSession(session.store, history_size=4)
+    restored.load_state(session.dump_state())
+
+    assert turns(restored) == turns(session)
+    assert restored.conversation_history.total_turns == 2 * len(QUESTIONS)
+    assert restored.context.summarized_turns == session.context.summarized_turns == 2
+    assert restored.context.topic_summary == session.context.topic_summary == {"services": 1, "pricing": 1}
+    assert restored.context.service_summary == session.context.service_summary == {"web": 1}
+    assert restored.context.last_topic == session.context.last_topic
+    assert restored.dump_state() == session.dump_state()
+
+def test_load_into_smaller_capacity_keeps_newest_turns(backend, session):
+    restored = backend.InonetecxChatSession(session.store, history_size=2)
+    restored.load_state(session.dump_state())
+
+    assert turns(restored) == turns(session)[-2:]
+    assert restored.conversation_history.total_turns == 2 * len(QUESTIONS)
+    # The dropped user turn is folded into the summary like an eviction
+    assert restored.context.summarized_turns == 3
+    assert restored.context.topic_summary == {"services": 1, "pricing": 1, "timeline": 1}
+    assert restored.context.service_summary == {"web": 1, "mobile": 1}
+
+def test_load_rejects_unknown_format(backend, session):
+    state = bytearray(session.dump_state())
+    state[0] = backend.InonetecxChatSession.STATE_FORMAT + 1
+    with pytest.raises(ValueError):
+        session.load_state(bytes(state))
+
+def test_concurrent_saves_keep_both_turns(backend, tmp_path):
+    path = str(tmp_path / "sessions.db")
+    store = backend.default_knowledge_base_store()
+    first = backend.SessionManager(store, session_store=backend.SQLiteSessionStore(path))
+    second = backend.SessionManager(store, session_store=backend.SQLiteSessionStore(path))
+    try:
+        session_id, a = first.get("shared")
+        first.save(session_id, a)
+        _, b = second.get(session_id)
+
+        a.respond("what services do you offer")
+        b.respond("how much does it cost")
+        first.save(session_id, a)
+        second.save(session_id, b)
+
+        _, merged = first.get(session_id)
+        assert [t.text for t in merged.conversation_history if t.role == "user"] == [
+            "what services do you offer", "how much does it cost"]
+        assert merged.state_version == 3
+    finally:
+        first.close()
+        second.close()
+
+def test_refresh_keeps_turns_not_saved_yet(backend, tmp_path):
+    path = str(tmp_path / "sessions.db")
+    store = backend.default_knowledge_base_store()
+    first = backend.SessionManager(store, session_store=backend.SQLiteSessionStore(path))
+    second = backend.SessionManager(store, session_store=backend.SQLiteSessionStore(path))
+    try:
+        session_id, a = first.get("shared")
+        first.save(session_id, a)
+        _, b = second.get(session_id)
+
+        # Worker 1 answers, worker 2 saves its own turn, and a second request
+        # on worker 1 refreshes before the first one has saved
+        a.respond("what services do you offer")
+        b.respond("how much does it cost")
+        second.save(session_id, b)
+        _, again = first.get(session_id)
+        assert again is a
+        first.save(session_id, a)
+
+        _, merged = second.get(session_id)
+        assert [t.text for t in merged.conversation_history if t.role == "user"] == [
+            "how much does it cost", "what services do you offer"]
+        assert merged.conversation_history.total_turns == 4
+    finally:
+        first.close()
+        second.close()
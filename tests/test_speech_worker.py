@@ -0,0 +1,37 @@
+"""SpeechWorker queueing and interruption, driven by FakeTTSEngine"""
+import time
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+def test_priority_interrupts_current_utterance(backend):
+    engine = backend.FakeTTSEngine(word_delay=0.01)
+    worker = backend.SpeechWorker(lambda: engine)
+    worker.start(wait=True)
+    long_text = " ".join(["word"] * 200)
+    worker.say(long_text)
+    worker.say("queued behind it")
+    wait_for(lambda: worker._speaking)
+
+    worker.say("urgent", priority=True)
+    worker.shutdown(finish_pending=True)
+
+    assert engine.interrupted == [long_text]
+    assert engine.spoken == ["urgent"]
+
+def test_full_queue_drops_oldest(backend):
+    engine = backend.FakeTTSEngine()
+    worker = backend.SpeechWorker(lambda: engine, maxsize=2)
+    # Not started yet, so nothing drains the queue
+    worker.say("first")
+    worker.say("second")
+    worker.say("third")
+
+    worker.start(wait=True)
+    worker.shutdown(finish_pending=True)
+
+    assert engine.spoken == ["second", "third"]
+    assert engine.interrupted == []
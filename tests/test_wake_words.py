@@ -0,0 +1,24 @@
+"""Wake word handling in transcripts"""
+import pytest
+
+@pytest.fixture
+def voice_loop(backend):
+    return backend.AsyncVoiceLoop(assistant=None, wake_words=("hey assistant", "computer"))
+
+@pytest.mark.parametrize("text, command", [
+    ("computer, what are your prices?", "what are your prices"),
+    ("Hey Assistant what services do you offer", "what services do you offer"),
+    ("...computer! stop", "stop"),
+    ("computer", ""),
+])
+def test_leading_wake_word_is_stripped(voice_loop, text, command):
+    assert voice_loop._after_wake_word(text) == command
+
+@pytest.mark.parametrize("text", [
+    "I need a computer vision system for my shop",
+    "what computer languages do you use",
+    "computers are great",
+    "hey assistants",
+])
+def test_wake_word_elsewhere_is_not_a_wake_word(voice_loop, text):
+    assert voice_loop._after_wake_word(text) is None